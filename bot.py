@@ -1,3 +1,6 @@
+import time
+import traceback
+
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -5,16 +8,21 @@ from discord.app_commands import Choice
 from dotenv import load_dotenv
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+from modules.store import flush_all
+from modules.http_client import http_client
 
 # CONFIGURATION
+# Loaded in this order. verify imports minecraft, so it has to come after it.
 extensions = [
     "cogs.tasks",
     "cogs.misc",
     "cogs.guild",
+    "cogs.minecraft",
     "cogs.verify",
     "cogs.tutorials",
-    "cogs.minecraft",
+    "cogs.announcements",
 ]
 
 load_dotenv()
@@ -28,6 +36,45 @@ class aclient(commands.Bot):
     def __init__(self):
         super().__init__(command_prefix="a!", intents=intents)
         self.synced = False
+        self.cog_load_times = {}
+
+    async def setup_hook(self):
+        await http_client.start()
+        await self.load_extensions()
+
+    async def load_extensions(self):
+        """Load every extension once, before connecting, and print how long each one took."""
+        started = time.perf_counter()
+        timings = {}
+        for ext in extensions:
+            await self.load_timed(ext, timings)
+
+        total = (time.perf_counter() - started) * 1000
+        print(f"[Startup] Loaded {len(timings)} extensions in {total:.1f} ms:")
+        print(f"[Startup]   {'extension':<22} {'import':>8}    {'cog_load':>8}")
+        for ext, (import_ms, setup_ms) in sorted(
+            timings.items(), key=lambda item: -sum(item[1])
+        ):
+            print(f"[Startup]   {ext:<22} {import_ms:8.1f} ms {setup_ms:8.1f} ms")
+
+    async def load_timed(self, ext: str, timings: Dict[str, Tuple[float, float]]):
+        started = time.perf_counter()
+        try:
+            await self.load_extension(ext)
+        except commands.ExtensionError as error:
+            print(f"[Startup] Failed to load {ext}:")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return
+        total = (time.perf_counter() - started) * 1000
+        # "import" is the rest of load_extension: running the module and its setup() up to add_cog.
+        setup = self.cog_load_times.pop(ext, 0.0)
+        timings[ext] = (total - setup, setup)
+
+    async def add_cog(self, cog: commands.Cog, **kwargs):
+        started = time.perf_counter()
+        await super().add_cog(cog, **kwargs)
+        # add_cog awaits the cog's cog_load, which is where the slow setup work lives.
+        self.cog_load_times[cog.__module__] = (time.perf_counter() - started) * 1000
 
     async def on_ready(self):
         await self.wait_until_ready()
@@ -36,8 +83,10 @@ class aclient(commands.Bot):
             self.synced = True
         print("Bot is ready.")
 
-        for ext in extensions:
-            await self.load_extension(ext)
+    async def close(self):
+        await super().close()
+        await http_client.close()
+        flush_all()
 
 
 bot = aclient()
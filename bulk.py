@@ -0,0 +1,77 @@
+"""Bulk import/export of verify, Minecraft and banned records.
+
+    python bulk.py import verify students.csv
+    python bulk.py export minecraft whitelist.jsonl
+
+With the JSON backend, run this while the bot is stopped, otherwise the bot's
+in-memory copy will overwrite the import. Imported Minecraft accounts are only
+recorded; use /bulk-import in Discord to also whitelist them on the server.
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import sys
+
+from modules import bulk
+from modules.store import flush_all
+
+
+def detect_format(path: str, fmt: str) -> str:
+    if fmt:
+        return fmt
+    return "jsonl" if path.lower().endswith(".jsonl") else "csv"
+
+
+async def run_import(dataset: str, path: str, fmt: str) -> int:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        try:
+            result = await bulk.import_rows(dataset, bulk.read_rows(f, fmt))
+        except (ValueError, csv.Error) as error:
+            print(f"Could not read {path}: {error}")
+            return 1
+
+    if result["errors"]:
+        print("Nothing was imported, fix these rows and try again:")
+        for error in result["errors"]:
+            print(f"  {error}")
+        return 1
+
+    flush_all()
+    print(
+        f"Imported {result['imported']} of {result['rows']} {dataset} rows "
+        f"in {result['seconds']:.2f}s ({result['rows_per_second']} rows/s)."
+    )
+    return 0
+
+
+async def run_export(dataset: str, path: str, fmt: str) -> int:
+    rows = await bulk.export_rows(dataset)
+    if path == "-":
+        bulk.write_rows(rows, fmt, dataset, sys.stdout)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            bulk.write_rows(rows, fmt, dataset, f)
+        print(f"Exported {len(rows)} {dataset} rows to {os.path.abspath(path)}.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("dataset", choices=list(bulk.DATASETS))
+    parser.add_argument("path", help="File to read or write ('-' exports to stdout)")
+    parser.add_argument("--format", choices=bulk.FORMATS, default=None)
+    args = parser.parse_args()
+
+    fmt = detect_format(args.path, args.format)
+    if args.action == "import":
+        return asyncio.run(run_import(args.dataset, args.path, fmt))
+    return asyncio.run(run_export(args.dataset, args.path, fmt))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+import os
+import time
+from datetime import datetime
+from typing import List
+
+import aiohttp
+
+# Custom modules
+from modules import enums
+from modules.store import sync_state
+from modules.trello_cards import TrelloError, fetch_list_cards
+
+# Minutes between polls of the Trello Announcements list, 0 to turn the publisher off.
+announcements_interval = int(os.getenv("ANNOUNCEMENTS_INTERVAL") or 0)
+
+
+def card_activity(card: dict) -> float:
+    """When the card was last touched, which for a card moved into the list is when it was moved."""
+    value = card.get("dateLastActivity")
+    if not value:
+        return 0.0
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def new_cards(cards: List[dict], seen: set) -> List[dict]:
+    """Cards on the list that have not been posted yet, least recently touched first."""
+    return sorted(
+        (card for card in cards if card["id"] not in seen), key=card_activity
+    )
+
+
+def build_announcement_embed(card: dict) -> discord.Embed:
+    embed = discord.Embed(
+        title=card["name"][:256],
+        description=card.get("desc", "")[:4096],
+        color=enums.EmbedStyle.Round.value,
+        url=card.get("shortUrl"),
+    )
+    embed.timestamp = discord.utils.utcnow()
+    return embed
+
+
+class Announcements(commands.Cog):
+    def __init__(self, bot: discord.Client):
+        self.bot = bot
+        print(f"{__name__} cog loaded.")
+
+        self.metrics = {
+            "polls": 0,
+            "errors": 0,
+            "published": 0,
+            "fetch_ms": 0.0,
+            "max_fetch_ms": 0.0,
+            "delay_s": 0.0,
+        }
+
+    async def cog_load(self):
+        if announcements_interval:
+            self.poller.change_interval(minutes=announcements_interval)
+            self.poller.start()
+
+    async def cog_unload(self):
+        self.poller.cancel()
+        sync_state.flush()
+
+    @tasks.loop(minutes=5)
+    async def poller(self):
+        guild = self.bot.get_guild(enums.Guild.LeicesterCS.value)
+        if guild is None:
+            return
+        try:
+            await self.publish_new(guild)
+        except (
+            TrelloError,
+            aiohttp.ClientError,
+            TimeoutError,
+            discord.HTTPException,
+        ) as error:
+            self.metrics["errors"] += 1
+            print(f"[Announcements] Poll failed: {error}")
+
+    @poller.before_loop
+    async def before_poller(self):
+        await self.bot.wait_until_ready()
+
+    async def publish_new(self, guild: discord.Guild) -> int:
+        guild_name = enums.Guild(guild.id).name
+        list_id = enums.TrelloLists[guild_name].value.Announcements.value
+        channel_id = enums.GuildChannels[guild_name].value.Announcements.value
+        key = f"announcements:{guild.id}"
+        state = sync_state.data.get(key)
+
+        started = time.perf_counter()
+        cards = await fetch_list_cards(
+            list_id, fields="id,name,desc,shortUrl,dateLastActivity"
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        self.metrics["polls"] += 1
+        self.metrics["fetch_ms"] += elapsed
+        self.metrics["max_fetch_ms"] = max(self.metrics["max_fetch_ms"], elapsed)
+
+        on_list = [card["id"] for card in cards]
+        if state is None:
+            # First run: treat whatever is already on the list as posted instead of posting it all.
+            sync_state.data[key] = {"posted": on_list}
+            sync_state.mark_dirty()
+            return 0
+
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            print(f"[Announcements] Channel {channel_id} not found, retrying next poll.")
+            return 0
+
+        # Only IDs still on the list are kept, so the state never grows past the list itself.
+        seen = set(state.get("posted", []))
+        posted = [card_id for card_id in on_list if card_id in seen]
+        published = 0
+        for card in new_cards(cards, seen):
+            await channel.send(embed=build_announcement_embed(card))
+            published += 1
+            self.metrics["published"] += 1
+            self.metrics["delay_s"] += max(time.time() - card_activity(card), 0)
+
+            # Saved after every post, so a failure part way through never re-posts earlier cards.
+            posted.append(card["id"])
+            sync_state.data[key] = {"posted": posted}
+            sync_state.mark_dirty()
+
+        if set(posted) != seen:
+            sync_state.data[key] = {"posted": posted}
+            sync_state.mark_dirty()
+        return published
+
+    def stats(self) -> dict:
+        m = self.metrics
+        return {
+            "polls": m["polls"],
+            "errors": m["errors"],
+            "published": m["published"],
+            "avg_fetch_ms": round(m["fetch_ms"] / m["polls"], 1) if m["polls"] else 0.0,
+            "max_fetch_ms": round(m["max_fetch_ms"], 1),
+            "avg_delay_s": round(m["delay_s"] / m["published"]) if m["published"] else 0,
+        }
+
+    @app_commands.command(
+        name="announcement-stats", description="Trello announcements publisher stats."
+    )
+    @app_commands.checks.has_any_role(enums.Roles.Administration.value)
+    async def announcement_stats(self, interaction: discord.Interaction):
+        stats = self.stats()
+        await interaction.response.send_message(
+            f"**{stats['published']}** announcements published from {stats['polls']} polls ({stats['errors']} failed).\n"
+            f"Trello fetch: avg {stats['avg_fetch_ms']} ms, max {stats['max_fetch_ms']} ms.\n"
+            f"Average time from card to post: {stats['avg_delay_s']} s.",
+            ephemeral=True,
+        )
+
+
+async def setup(bot):
+    await bot.add_cog(Announcements(bot))
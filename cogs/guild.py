@@ -1,19 +1,95 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import os
-from trello import TrelloApi
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+import aiohttp
 
 # Custom modules
 from modules import enums
-
-trello_key = os.getenv("TRELLO_KEY")
-trello_token = os.getenv("TRELLO_TOKEN")
-
-trello = None
-if trello_key and trello_token:
-    trello = TrelloApi(trello_key)
-    trello.set_token(trello_token)
+from modules.ratelimit import RateLimiter
+from modules.store import sync_state
+from modules.trello_cards import (
+    TrelloError,
+    card_signature,
+    content_hash,
+    fetch_list_cards,
+)
+
+# Minutes between automatic rules syncs from Trello, 0 to only sync with /update-rules.
+rules_sync_interval = int(os.getenv("RULES_SYNC_INTERVAL") or 0)
+
+
+def build_rules_embeds(cards: List[dict]) -> List[discord.Embed]:
+    first_card = cards[0]
+    first_card_name = first_card["name"].split("|", 1)
+    first_embed = discord.Embed(
+        title=first_card_name[0], description=first_card_name[1]
+    )
+    first_embed.set_image(url=first_card["desc"])
+
+    main_embed = discord.Embed()
+    for card in cards[1:-1]:
+        main_embed.add_field(name=card["name"], value=card["desc"], inline=False)
+
+    last_embed = discord.Embed(title=cards[-1]["name"], description=cards[-1]["desc"])
+
+    return [first_embed, main_embed, last_embed]
+
+
+async def find_rules_message(bot, channel: discord.TextChannel, state: dict):
+    if state.get("message_id") and state.get("channel_id") == channel.id:
+        return channel.get_partial_message(state["message_id"])
+
+    # Rules posted before the message ID was stored: look for the bot's message once.
+    async for message in channel.history(limit=50, oldest_first=True):
+        if message.author == bot.user:
+            return message
+    return None
+
+
+async def sync_rules(bot, guild: discord.Guild, force: bool = False) -> str:
+    """Bring the rules message in line with the Trello Rules list. Returns "posted", "updated" or "unchanged"."""
+    channel = guild.rules_channel
+    guild_name = enums.Guild(guild.id).name
+    rules_list_id = enums.TrelloLists[guild_name].value.Rules.value
+    key = f"rules:{guild.id}"
+    state = sync_state.data.get(key, {})
+
+    cards = await fetch_list_cards(rules_list_id)
+    signature = card_signature(cards)
+    if state.get("cards") == signature and not force:
+        return "unchanged"
+
+    embeds = build_rules_embeds(cards)
+    digest = content_hash([embed.to_dict() for embed in embeds])
+
+    message = await find_rules_message(bot, channel, state)
+    if message is not None and state.get("hash") == digest:
+        # Cards were touched without changing what is shown, remember them so the next poll stops early.
+        sync_state.data[key] = {**state, "cards": signature}
+        sync_state.mark_dirty()
+        return "unchanged"
+
+    result = "updated"
+    if message is not None:
+        try:
+            await message.edit(embeds=embeds)
+        except discord.NotFound:
+            message = None
+    if message is None:
+        message = await channel.send(embeds=embeds)
+        result = "posted"
+
+    sync_state.data[key] = {
+        "channel_id": channel.id,
+        "message_id": message.id,
+        "hash": digest,
+        # Only stored once the message is up to date, so a failed edit is retried next poll.
+        "cards": signature,
+    }
+    sync_state.mark_dirty()
+    return result
 
 
 class Guild(commands.Cog):
@@ -21,9 +97,35 @@ class Guild(commands.Cog):
         self.bot = bot
         print(f"{__name__} cog loaded.")
 
-        bot.add_view(YearRoleAssign_buttons())
-        bot.add_view(SocialRoleAssign_buttons())
-        bot.add_view(PronounRoleAssign_buttons())
+        for group in ROLE_ASSIGN:
+            bot.add_view(RoleAssignView(group))
+
+    async def cog_load(self):
+        self.evict_cooldowns.start()
+        if rules_sync_interval:
+            self.rules_poller.start()
+
+    async def cog_unload(self):
+        self.evict_cooldowns.cancel()
+        self.rules_poller.cancel()
+        sync_state.flush()
+
+    @tasks.loop(minutes=5)
+    async def evict_cooldowns(self):
+        role_cooldown.evict_idle()
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            role_cache.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        role_cache.invalidate(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        role_cache.invalidate(role.guild.id)
 
     @app_commands.checks.has_any_role(enums.Roles.Administration.value)
     @app_commands.guild_only()
@@ -32,39 +134,48 @@ class Guild(commands.Cog):
     )
     async def update_rules(self, interaction: discord.Interaction):
         channel = interaction.guild.rules_channel
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        result = await sync_rules(self.bot, interaction.guild, force=True)
+        messages = {
+            "posted": f"📒 Rules posted in {channel.mention}.",
+            "updated": f"📒 Rules updated in {channel.mention}.",
+            "unchanged": f"📒 Rules in {channel.mention} are already up to date.",
+        }
+        await interaction.followup.send(messages[result], ephemeral=True)
+
+    @tasks.loop(minutes=rules_sync_interval or 1)
+    async def rules_poller(self):
+        guild = self.bot.get_guild(enums.Guild.LeicesterCS.value)
+        if guild is None:
+            return
+        try:
+            result = await sync_rules(self.bot, guild)
+        except (
+            TrelloError,
+            aiohttp.ClientError,
+            TimeoutError,
+            discord.HTTPException,
+        ) as error:
+            print(f"[Rules] Sync failed: {error}")
+            return
+        if result != "unchanged":
+            print(f"[Rules] Rules {result} from Trello.")
 
-        guild_name = enums.Guild(interaction.guild.id).name
-        rules_list_id = enums.TrelloLists[guild_name].value.Rules.value
-
-        list = [card for card in trello.lists.get_card(rules_list_id)]
-
-        first_card = list[0]
-        first_card_name = first_card["name"].split("|", 1)
-        first_embed = discord.Embed(
-            title=first_card_name[0], description=first_card_name[1]
-        )
-        first_embed.set_image(url=first_card["desc"])
-
-        main_embed = discord.Embed()
-        for card in list[1:-1]:
-            main_embed.add_field(name=card["name"], value=card["desc"], inline=False)
-
-        last_embed = discord.Embed(title=list[-1]["name"], description=list[-1]["desc"])
-
-        embeds = [first_embed, main_embed, last_embed]
-
-        async for message in channel.history(limit=50, oldest_first=True):
-            if message.author == self.bot.user:
-                await message.edit(embeds=embeds)
-                await interaction.response.send_message(
-                    f"📒 Rules updated in {channel.mention}.", ephemeral=True
-                )
-                return
-
-        await channel.send(embeds=embeds)
+    @rules_poller.before_loop
+    async def before_rules_poller(self):
+        await self.bot.wait_until_ready()
 
+    @app_commands.command(
+        name="role-assign-stats", description="Role assign cooldown usage."
+    )
+    @app_commands.checks.has_any_role(enums.Roles.Administration.value)
+    async def role_assign_stats(self, interaction: discord.Interaction):
+        stats = role_cooldown.stats()
         await interaction.response.send_message(
-            f"📒 Rules updated in {channel.mention}.", ephemeral=True
+            f"**{stats['allowed']}** clicks allowed, **{stats['rejected']['user']}** slowed down.\n"
+            f"Tracking {stats['tracked']['user']} users.",
+            ephemeral=True,
         )
 
     @app_commands.command(
@@ -83,40 +194,10 @@ class Guild(commands.Cog):
             interaction.response.send_message(":x: Channel not found.")
             return
 
-        embed = discord.Embed(
-            title="Role assign",
-            description="Assign roles to yourself!\nWhich year are you in?",
-        )
-
-        embed.add_field(name="🏗️ Foundation year", value="Foundation year")
-        embed.add_field(name="1️⃣ Year 1", value="First year")
-        embed.add_field(name="2️⃣ Year 2", value="Second year")
-        embed.add_field(name="🥪 Year in Industry/Abroad", value="Year in Industry")
-        embed.add_field(name="3️⃣ Year 3", value="Third year")
-        embed.add_field(name="🎓 Postgraduate", value="Postgraduate")
-
-        await channel.send(embed=embed, view=YearRoleAssign_buttons())
-
-        embed2 = discord.Embed(
-            title="Role assign", description="What are your pronouns?"
-        )
-
-        embed2.add_field(name=":male_sign: He/him", value="He/him")
-        embed2.add_field(name=":female_sign: She/her", value="She/her")
-        embed2.add_field(name=":transgender_symbol: They/them", value="They/them")
-        embed2.add_field(name=":heart: Other", value="Other pronouns")
-
-        await channel.send(embed=embed2, view=PronounRoleAssign_buttons())
-
-        embed3 = discord.Embed(
-            title="Role assign", description="What do you want notifications for?"
-        )
-
-        embed3.add_field(name="🖥️ Hackathons", value="Hackathons")
-        embed3.add_field(name="📢 Talks", value="Talks")
-        embed3.add_field(name="🍹 Socials", value="Socials")
-
-        await channel.send(embed=embed3, view=SocialRoleAssign_buttons())
+        for group in ROLE_ASSIGN:
+            await channel.send(
+                embed=role_assign_embed(group), view=RoleAssignView(group)
+            )
 
         await interaction.response.send_message(
             f"🔲 Role assign message updated in {channel.mention}.", ephemeral=True
@@ -127,175 +208,312 @@ async def setup(bot):
     await bot.add_cog(Guild(bot))
 
 
-def key(interaction: discord.Interaction):
-    return interaction.user
-
-
-class YearRoleAssign_buttons(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
-        self.cd = commands.CooldownMapping.from_cooldown(6, 10, key)
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        retry_after = self.cd.update_rate_limit(interaction)
-
-        if retry_after:
-            await interaction.response.send_message(
-                f":stopwatch: Slow down! Try again in **{int(retry_after)} seconds**.",
-                ephemeral=True,
-            )
-            return False
-        else:
-            return True
-
-    async def role_update(self, interaction: discord.Interaction, role_name):
-        role = discord.utils.get(interaction.guild.roles, name=role_name)
-
-        if role not in interaction.user.roles:
-            await interaction.user.add_roles(role)
-            await interaction.response.send_message(
-                f":black_square_button: {role.mention} role **added**.", ephemeral=True
-            )
-        else:
-            await interaction.user.remove_roles(role)
-            await interaction.response.send_message(
-                f":black_square_button: {role.mention} role **removed**.",
-                ephemeral=True,
-            )
-
-        return
-
-    @discord.ui.button(
-        label="Foundation year",
-        style=discord.ButtonStyle.gray,
-        emoji="🏗️",
-        custom_id="foundation_year",
-    )
-    async def found(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "Foundation year")
-
-    @discord.ui.button(
-        label="First year",
-        style=discord.ButtonStyle.gray,
-        emoji="1️⃣",
-        custom_id="First_year",
-    )
-    async def year1(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "Year 1")
-
-    @discord.ui.button(
-        label="Second year",
-        style=discord.ButtonStyle.gray,
-        emoji="2️⃣",
-        custom_id="Second_year",
-    )
-    async def year2(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "Year 2")
-
-    @discord.ui.button(
-        label="Year in Industry",
-        style=discord.ButtonStyle.gray,
-        row=2,
-        emoji="🥪",
-        custom_id="sandwich_year",
-    )
-    async def sandwich(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        await self.role_update(interaction, "Year in Industry/Abroad")
-
-    @discord.ui.button(
-        label="Third year",
-        style=discord.ButtonStyle.gray,
-        row=2,
-        emoji="3️⃣",
-        custom_id="Third_year",
+class RoleButton(NamedTuple):
+    custom_id: str
+    role_name: str
+    label: str
+    emoji: Optional[str]
+    row: Optional[int]
+    # (name, value) of the matching field in the role assign embed.
+    field: Tuple[str, str]
+
+
+class RoleGroup(NamedTuple):
+    description: str
+    buttons: List[RoleButton]
+    # A member can hold at most one role of an exclusive group.
+    exclusive: bool
+
+
+# Every role assign message: embed description and its buttons. custom_ids must never change, they are what
+# ties already posted messages to these views.
+ROLE_ASSIGN = {
+    "year": RoleGroup(
+        "Assign roles to yourself!\nWhich year are you in?",
+        [
+            RoleButton(
+                "foundation_year",
+                "Foundation year",
+                "Foundation year",
+                "🏗️",
+                None,
+                ("🏗️ Foundation year", "Foundation year"),
+            ),
+            RoleButton(
+                "First_year",
+                "Year 1",
+                "First year",
+                "1️⃣",
+                None,
+                ("1️⃣ Year 1", "First year"),
+            ),
+            RoleButton(
+                "Second_year",
+                "Year 2",
+                "Second year",
+                "2️⃣",
+                None,
+                ("2️⃣ Year 2", "Second year"),
+            ),
+            RoleButton(
+                "sandwich_year",
+                "Year in Industry/Abroad",
+                "Year in Industry",
+                "🥪",
+                2,
+                ("🥪 Year in Industry/Abroad", "Year in Industry"),
+            ),
+            RoleButton(
+                "Third_year",
+                "Year 3",
+                "Third year",
+                "3️⃣",
+                2,
+                ("3️⃣ Year 3", "Third year"),
+            ),
+            RoleButton(
+                "postgraduate",
+                "Postgraduate",
+                "Postgraduate",
+                "🎓",
+                2,
+                ("🎓 Postgraduate", "Postgraduate"),
+            ),
+        ],
+        True,
+    ),
+    "pronouns": RoleGroup(
+        "What are your pronouns?",
+        [
+            RoleButton(
+                "he_him",
+                "He/him",
+                "♂️ He/him",
+                None,
+                None,
+                (":male_sign: He/him", "He/him"),
+            ),
+            RoleButton(
+                "she_her",
+                "She/her",
+                "♀️ She/her",
+                None,
+                None,
+                (":female_sign: She/her", "She/her"),
+            ),
+            RoleButton(
+                "they_them",
+                "They/them",
+                "⚧️ They/them",
+                None,
+                None,
+                (":transgender_symbol: They/them", "They/them"),
+            ),
+            RoleButton(
+                "other_pronouns",
+                "Other pronouns",
+                "Other",
+                "❤️",
+                None,
+                (":heart: Other", "Other pronouns"),
+            ),
+        ],
+        False,
+    ),
+    "pings": RoleGroup(
+        "What do you want notifications for?",
+        [
+            RoleButton(
+                "hackathons",
+                "Hackathon Ping",
+                "Hackathons",
+                "🖥️",
+                None,
+                ("🖥️ Hackathons", "Hackathons"),
+            ),
+            RoleButton("talks", "Talks Ping", "Talks", "📢", None, ("📢 Talks", "Talks")),
+            RoleButton(
+                "socials",
+                "Social Ping",
+                "Socials",
+                "🍹",
+                None,
+                ("🍹 Socials", "Socials"),
+            ),
+        ],
+        False,
+    ),
+}
+
+ROLE_NAMES = {
+    button.custom_id: button.role_name
+    for group in ROLE_ASSIGN.values()
+    for button in group.buttons
+}
+
+
+class RoleCache:
+    """custom_id -> role ID per guild, built with one pass over the guild's roles and dropped when roles change."""
+
+    def __init__(self, role_names: Dict[str, str]):
+        self.role_names = role_names
+        self.guilds = {}
+
+    def build(self, guild: discord.Guild) -> Dict[str, int]:
+        ids_by_name = {role.name: role.id for role in guild.roles}
+        role_ids = {
+            custom_id: ids_by_name[name]
+            for custom_id, name in self.role_names.items()
+            if name in ids_by_name
+        }
+        self.guilds[guild.id] = role_ids
+        return role_ids
+
+    def get(self, guild: discord.Guild, custom_id: str) -> Optional[discord.Role]:
+        role_ids = self.guilds.get(guild.id)
+        if role_ids is None:
+            role_ids = self.build(guild)
+        role_id = role_ids.get(custom_id)
+        return guild.get_role(role_id) if role_id is not None else None
+
+    def invalidate(self, guild_id: int):
+        self.guilds.pop(guild_id, None)
+
+
+role_cache = RoleCache(ROLE_NAMES)
+
+# One budget per user across every role assign panel: 6 clicks, refilling over 10 seconds.
+role_cooldown = RateLimiter({"user": (6, 10)})
+
+
+def role_assign_embed(group: str) -> discord.Embed:
+    embed = discord.Embed(
+        title="Role assign", description=ROLE_ASSIGN[group].description
     )
-    async def year3(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "Year 3")
-
-    @discord.ui.button(
-        label="Postgraduate",
-        style=discord.ButtonStyle.gray,
-        row=2,
-        emoji="🎓",
-        custom_id="postgraduate",
-    )
-    async def postg(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "Postgraduate")
-
-
-class PronounRoleAssign_buttons(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
-        self.cd = commands.CooldownMapping.from_cooldown(6, 10, key)
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        retry_after = self.cd.update_rate_limit(interaction)
+    for button in ROLE_ASSIGN[group].buttons:
+        embed.add_field(name=button.field[0], value=button.field[1])
+    return embed
+
+
+def held_in_group(member: discord.Member, roles: Dict[str, discord.Role]) -> Set[str]:
+    # Member.get_role looks the ID up in the member's sorted role IDs, no scan over Role objects.
+    return {
+        custom_id
+        for custom_id, role in roles.items()
+        if member.get_role(role.id) is not None
+    }
+
+
+def group_roles(guild: discord.Guild, group: str) -> Dict[str, discord.Role]:
+    roles = {}
+    for button in ROLE_ASSIGN[group].buttons:
+        role = role_cache.get(guild, button.custom_id)
+        if role is not None:
+            roles[button.custom_id] = role
+    return roles
+
+
+async def set_group_roles(
+    interaction: discord.Interaction,
+    group: str,
+    roles: Dict[str, discord.Role],
+    selected: Set[str],
+):
+    """Give the member exactly the `selected` roles of a group with one member edit, whatever they held before."""
+    member = interaction.user
+    held = held_in_group(member, roles)
+    added = [roles[c] for c in selected - held if c in roles]
+    removed = [roles[c] for c in held - selected]
+
+    if not added and not removed:
+        await interaction.response.send_message(
+            ":black_square_button: Your roles are already up to date.", ephemeral=True
+        )
+        return
 
-        if retry_after:
-            await interaction.response.send_message(
-                f":stopwatch: Slow down! Try again in **{int(retry_after)} seconds**.",
-                ephemeral=True,
-            )
-            return False
-        else:
-            return True
+    group_ids = {role.id for role in roles.values()}
+    final_roles = [
+        role
+        for role in member.roles
+        if not role.is_default() and role.id not in group_ids
+    ]
+    final_roles += [roles[c] for c in selected if c in roles]
+    await member.edit(roles=final_roles)
 
-    async def role_update(self, interaction: discord.Interaction, role_name):
-        role = discord.utils.get(interaction.guild.roles, name=role_name)
+    lines = [f":black_square_button: {role.mention} role **added**." for role in added]
+    lines += [f":black_square_button: {role.mention} role **removed**." for role in removed]
+    await interaction.response.send_message("\n".join(lines), ephemeral=True)
 
-        if role not in interaction.user.roles:
-            await interaction.user.add_roles(role)
-            await interaction.response.send_message(
-                f":black_square_button: {role.mention} role **added**.", ephemeral=True
-            )
-        else:
-            await interaction.user.remove_roles(role)
-            await interaction.response.send_message(
-                f":black_square_button: {role.mention} role **removed**.",
-                ephemeral=True,
-            )
 
+async def toggle_role(interaction: discord.Interaction, group: str, custom_id: str):
+    roles = group_roles(interaction.guild, group)
+    if custom_id not in roles:
+        await interaction.response.send_message(
+            ":x: That role doesn't exist anymore.", ephemeral=True
+        )
         return
 
-    @discord.ui.button(
-        label="♂️ He/him", style=discord.ButtonStyle.gray, custom_id="he_him"
-    )
-    async def hehim(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "He/him")
-
-    @discord.ui.button(
-        label="♀️ She/her", style=discord.ButtonStyle.gray, custom_id="she_her"
-    )
-    async def sheher(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "She/her")
+    held = held_in_group(interaction.user, roles)
+    if custom_id in held:
+        selected = held - {custom_id}
+    elif ROLE_ASSIGN[group].exclusive:
+        selected = {custom_id}
+    else:
+        selected = held | {custom_id}
+    await set_group_roles(interaction, group, roles, selected)
+
+
+class RoleAssignButton(discord.ui.Button):
+    def __init__(self, group: str, **kwargs):
+        super().__init__(**kwargs)
+        self.group = group
+
+    async def callback(self, interaction: discord.Interaction):
+        await toggle_role(interaction, self.group, self.custom_id)
+
+
+class RoleAssignSelect(discord.ui.Select):
+    """Set every role of a group in one go."""
+
+    def __init__(self, group: str):
+        exclusive = ROLE_ASSIGN[group].exclusive
+        buttons = ROLE_ASSIGN[group].buttons
+        super().__init__(
+            placeholder="Pick your role" if exclusive else "Pick all your roles",
+            min_values=0,
+            max_values=1 if exclusive else len(buttons),
+            options=[
+                discord.SelectOption(label=b.label, value=b.custom_id, emoji=b.emoji)
+                for b in buttons
+            ],
+            custom_id=f"role_select:{group}",
+            row=4,
+        )
+        self.group = group
 
-    @discord.ui.button(
-        label="⚧️ They/them", style=discord.ButtonStyle.gray, custom_id="they_them"
-    )
-    async def theythem(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        await self.role_update(interaction, "They/them")
-
-    @discord.ui.button(
-        label="Other",
-        style=discord.ButtonStyle.gray,
-        emoji="❤️",
-        custom_id="other_pronouns",
-    )
-    async def other(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "Other pronouns")
+    async def callback(self, interaction: discord.Interaction):
+        roles = group_roles(interaction.guild, self.group)
+        await set_group_roles(interaction, self.group, roles, set(self.values))
 
 
-class SocialRoleAssign_buttons(discord.ui.View):
-    def __init__(self):
+class RoleAssignView(discord.ui.View):
+    def __init__(self, group: str):
         super().__init__(timeout=None)
-        self.cd = commands.CooldownMapping.from_cooldown(6, 10, key)
+        for button in ROLE_ASSIGN[group].buttons:
+            self.add_item(
+                RoleAssignButton(
+                    group,
+                    label=button.label,
+                    style=discord.ButtonStyle.gray,
+                    emoji=button.emoji,
+                    row=button.row,
+                    custom_id=button.custom_id,
+                )
+            )
+        self.add_item(RoleAssignSelect(group))
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        retry_after = self.cd.update_rate_limit(interaction)
+        retry_after = role_cooldown.acquire(user=interaction.user.id)
 
         if retry_after:
             await interaction.response.send_message(
@@ -305,45 +523,3 @@ class SocialRoleAssign_buttons(discord.ui.View):
             return False
         else:
             return True
-
-    async def role_update(self, interaction: discord.Interaction, role_name):
-        role = discord.utils.get(interaction.guild.roles, name=role_name)
-
-        if role not in interaction.user.roles:
-            await interaction.user.add_roles(role)
-            await interaction.response.send_message(
-                f":black_square_button: {role.mention} role **added**.", ephemeral=True
-            )
-        else:
-            await interaction.user.remove_roles(role)
-            await interaction.response.send_message(
-                f":black_square_button: {role.mention} role **removed**.",
-                ephemeral=True,
-            )
-
-        return
-
-    @discord.ui.button(
-        label="Hackathons",
-        style=discord.ButtonStyle.gray,
-        emoji="🖥️",
-        custom_id="hackathons",
-    )
-    async def updates(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        await self.role_update(interaction, "Hackathon Ping")
-
-    @discord.ui.button(
-        label="Talks", style=discord.ButtonStyle.gray, emoji="📢", custom_id="talks"
-    )
-    async def news(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.role_update(interaction, "Talks Ping")
-
-    @discord.ui.button(
-        label="Socials", style=discord.ButtonStyle.gray, emoji="🍹", custom_id="socials"
-    )
-    async def gamenights(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        await self.role_update(interaction, "Social Ping")
@@ -1,19 +1,17 @@
-import aiohttp
+import asyncio
 import os
 import re
+import time
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from dotenv import load_dotenv
 from mcstatus import JavaServer
 from modules import enums
-from modules.utils import ensure_json_exists
+from modules.store import verify_store, mc_store
+from modules.http_client import http_client
 import traceback
-import json
 from typing import List
 
-load_dotenv()
-
 verified_role_id = int(os.getenv("VERIFIED_ROLE_ID"))
 dmu_verified_role_id = int(os.getenv("DMU_VERIFIED_ROLE_ID"))
 get_verified_channel = int(os.getenv("GET_VERIFIED_CHANNEL"))
@@ -25,33 +23,107 @@ mcsmanager_instance_id = os.getenv("MCSMANAGER_INSTANCE_ID")
 mc_whitelisted_role_id = int(os.getenv("MC_WHITELISTED_ROLE_ID"))
 mc_address = os.getenv("MC_ADDRESS")
 mc_port = os.getenv("MC_PORT")
+mc_status_interval = int(os.getenv("MC_STATUS_INTERVAL") or 60)
+
+# How long a resolved SRV/DNS lookup is reused before resolving again.
+MC_LOOKUP_TTL = 3600
 
 MC_USERNAME_PATTERN = re.compile(r"^[a-zA-Z0-9_]{2,16}$")
 mcs_command_url = f"{mcsmanager_host}/api/protected_instance/command"
 
 
-async def unwhitelist_pipeline(minecraft_usernames: List[str]):
+async def send_console_command(command: str) -> bool:
     params = {
         "apikey": mcsmanager_token,
         "uuid": mcsmanager_instance_id,
         "daemonId": mcsmanager_daemon_id,
-        "command": "; ".join([f"whitelist remove {u}" for u in minecraft_usernames]),
+        "command": command,
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(mcs_command_url, params=params) as resp:
-            return resp.status == 200
+    async with http_client.post(mcs_command_url, params=params) as resp:
+        return resp.status == 200
+
+
+class WhitelistBatcher:
+    """Collects whitelist adds/removes for a short window and sends them to MCSManager as one console command.
+
+    An add followed by a remove of the same username inside the window cancels out and is never sent.
+    """
+
+    def __init__(self, window: float = 0.5, max_commands: int = 50):
+        self.window = window
+        self.max_commands = max_commands
+        self.pending = {}  # username_lower -> (action, username, [futures])
+        self._task = None
+
+    async def add(self, username: str) -> bool:
+        return await self._queue([("add", username)])
+
+    async def remove(self, usernames: List[str]) -> bool:
+        if not usernames:
+            return True
+        return await self._queue([("remove", u) for u in usernames])
+
+    async def _queue(self, actions) -> bool:
+        loop = asyncio.get_running_loop()
+        futures = []
+
+        for action, username in actions:
+            future = loop.create_future()
+            futures.append(future)
+
+            key = username.lower()
+            previous = self.pending.pop(key, None)
+            if previous and previous[0] == "add" and action == "remove":
+                for waiter in previous[2] + [future]:
+                    waiter.set_result(True)
+                continue
+
+            waiters = previous[2] if previous else []
+            self.pending[key] = (action, username, waiters + [future])
+
+        if self.pending and self._task is None:
+            self._task = asyncio.create_task(self._flush_later())
+
+        return all(await asyncio.gather(*futures))
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._task = None
+        await self.flush()
+
+    async def flush(self):
+        items = list(self.pending.values())
+        self.pending = {}
+
+        for i in range(0, len(items), self.max_commands):
+            chunk = items[i : i + self.max_commands]
+            command = "; ".join(
+                f"whitelist {action} {username}" for action, username, _ in chunk
+            )
+            try:
+                success = await send_console_command(command)
+            except Exception as error:
+                traceback.print_exception(type(error), error, error.__traceback__)
+                success = False
+
+            for _, _, waiters in chunk:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(success)
+
+
+whitelist_batcher = WhitelistBatcher()
+
+
+async def unwhitelist_pipeline(minecraft_usernames: List[str]):
+    return await whitelist_batcher.remove(minecraft_usernames)
 
 
 async def unwhitelist_account(
     interaction: discord.Interaction, discord_id: str, respond: bool = True
 ):
-    with open(enums.FileLocations.MCData.value, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    removed_usernames = []
-
-    if discord_id not in data:
+    if not await mc_store.has(discord_id):
         if respond:
             await interaction.response.send_message(
                 "No Minecraft accounts found to unwhitelist.",
@@ -59,7 +131,7 @@ async def unwhitelist_account(
             )
         return
 
-    removed_usernames = data.pop(discord_id, [])
+    removed_usernames = await mc_store.pop(discord_id)
     pretty_removed_usernames = ", ".join(f"`{u}`" for u in removed_usernames)
 
     member = interaction.guild.get_member(int(discord_id))
@@ -68,9 +140,6 @@ async def unwhitelist_account(
         if role in member.roles:
             await member.remove_roles(role)
 
-    with open(enums.FileLocations.MCData.value, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-
     success = await unwhitelist_pipeline(removed_usernames)
     if respond:
         if success:
@@ -95,10 +164,7 @@ async def start_whitelist_process(interaction: discord.Interaction):
         )
         return
 
-    with open(enums.FileLocations.Verify.value, "r", encoding="utf-8") as f:
-        verify_data = json.load(f)
-
-    if str(interaction.user.id) not in verify_data:
+    if not await verify_store.has(str(interaction.user.id)):
         await interaction.response.send_message(
             "Please run `/verify` first. We migrated to a new process as of the 13/09/2025 so you'll need to run verify again.",
             ephemeral=True,
@@ -111,42 +177,86 @@ async def start_whitelist_process(interaction: discord.Interaction):
 class Minecraft(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        ensure_json_exists(enums.FileLocations.MCData.value)
         print(f"{__name__} cog loaded.")
         bot.add_view(WhitelistButtons())
 
+        self.server = None
+        self.server_resolved = 0
+        self.status = None
+        self.status_checked = 0
+        self.status_poller.start()
+
+    async def cog_load(self):
+        await asyncio.to_thread(mc_store.load)
+
+    async def cog_unload(self):
+        self.status_poller.cancel()
+        await whitelist_batcher.flush()
+        mc_store.flush()
+
+    async def resolve_server(self) -> JavaServer:
+        if self.server is None or time.time() - self.server_resolved > MC_LOOKUP_TTL:
+            self.server = await JavaServer.async_lookup(f"{mc_address}:{mc_port}")
+            self.server_resolved = time.time()
+        return self.server
+
+    async def poll_status(self):
+        try:
+            server = await self.resolve_server()
+            status = await server.async_status()
+            self.status = {
+                "online": True,
+                "version": status.version.name,
+                "players_online": status.players.online,
+                "max_players": status.players.max,
+            }
+        except Exception:
+            # Resolve again next time in case the address moved.
+            self.server = None
+            self.status = {
+                "online": False,
+                "version": "Unknown",
+                "players_online": 0,
+                "max_players": 0,
+            }
+        self.status_checked = time.time()
+
+    @tasks.loop(seconds=mc_status_interval)
+    async def status_poller(self):
+        await self.poll_status()
+
     @app_commands.command(
         name="mcstatus",
         description="Check the status of the LeicesterMC Minecraft server",
     )
     async def mcstatus(self, interaction: discord.Interaction):
-        try:
-            server = JavaServer.lookup(f"{mc_address}:{mc_port}")
-            status = server.status()
-            version = status.version.name
-            online = True
-            players_online = status.players.online
-            max_players = status.players.max
-            status_text = "🟢 Online"
-        except Exception:
-            version = "Unknown"
-            online = False
-            players_online = 0
-            max_players = 0
-            status_text = "🔴 Offline"
+        if self.status is None:
+            await interaction.response.defer()
+            await self.poll_status()
 
+        online = self.status["online"]
         embed = discord.Embed(
             title="🎮 LeicesterMC Server Status",
             color=discord.Color.green() if online else discord.Color.red(),
         )
         embed.add_field(name="Address", value=mc_address, inline=False)
-        embed.add_field(name="Version", value=version, inline=True)
-        embed.add_field(name="Status", value=status_text, inline=True)
+        embed.add_field(name="Version", value=self.status["version"], inline=True)
+        embed.add_field(
+            name="Status", value="🟢 Online" if online else "🔴 Offline", inline=True
+        )
         embed.add_field(
-            name="Players", value=f"{players_online}/{max_players}", inline=True
+            name="Players",
+            value=f"{self.status['players_online']}/{self.status['max_players']}",
+            inline=True,
+        )
+        embed.add_field(
+            name="Last Checked", value=f"<t:{int(self.status_checked)}:R>", inline=False
         )
 
-        await interaction.response.send_message(embed=embed)
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
 
     @app_commands.command(
         name="whitelist", description="Link your MC account & whitelist it."
@@ -192,16 +302,7 @@ class Minecraft(commands.Cog):
             return
 
         if mc_username:
-            with open(enums.FileLocations.MCData.value, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            username_lower = mc_username.strip().lower()
-            target_discord_id = None
-
-            for discord_id, usernames in data.items():
-                if username_lower in [u.lower() for u in usernames]:
-                    target_discord_id = discord_id
-                    break
+            target_discord_id = await mc_store.find_by_username(mc_username)
 
             if not target_discord_id:
                 await interaction.response.send_message(
@@ -336,54 +437,44 @@ class WhitelistModal(discord.ui.Modal, title="Minecraft Whitelist"):
             )
             return
 
-        with open(enums.FileLocations.MCData.value, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
         discord_id = str(interaction.user.id)
-        if discord_id not in data:
-            data[discord_id] = []
 
-        for temp_discordId, usernames in data.items():
-            if username.lower() in [u.lower() for u in usernames]:
-                await interaction.response.send_message(
-                    "This Minecraft account is already whitelisted.",
-                    ephemeral=True,
-                )
-                return
+        # The batch window and console calls can outlast the 3 second interaction deadline.
+        await interaction.response.defer(ephemeral=True, thinking=True)
 
-        data[discord_id].append(username)
+        if await mc_store.find_by_username(username) is not None:
+            await interaction.followup.send(
+                "This Minecraft account is already whitelisted.",
+                ephemeral=True,
+            )
+            return
 
-        with open(enums.FileLocations.MCData.value, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        await mc_store.add(discord_id, username)
 
         role = interaction.guild.get_role(mc_whitelisted_role_id)
         await interaction.user.add_roles(role)
 
-        params = {
-            "apikey": mcsmanager_token,
-            "uuid": mcsmanager_instance_id,
-            "daemonId": mcsmanager_daemon_id,
-            "command": f"whitelist add {username}",
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(mcs_command_url, params=params) as resp:
-                if resp.status == 200:
-                    await interaction.response.send_message(
-                        f"Successfully whitelisted `{username}`!", ephemeral=True
-                    )
-                else:
-                    await interaction.response.send_message(
-                        "Failed to add you to the whitelist. Please try again later.\nYou can DM a member of the committee to manually whitelist you.",
-                        ephemeral=True,
-                    )
+        if await whitelist_batcher.add(username):
+            await interaction.followup.send(
+                f"Successfully whitelisted `{username}`!", ephemeral=True
+            )
+        else:
+            await interaction.followup.send(
+                "Failed to add you to the whitelist. Please try again later.\nYou can DM a member of the committee to manually whitelist you.",
+                ephemeral=True,
+            )
 
     async def on_error(
         self, interaction: discord.Interaction, error: Exception
     ) -> None:
-        await interaction.response.send_message(
-            "Oops! Something went wrong.", ephemeral=True
-        )
+        if interaction.response.is_done():
+            await interaction.followup.send(
+                "Oops! Something went wrong.", ephemeral=True
+            )
+        else:
+            await interaction.response.send_message(
+                "Oops! Something went wrong.", ephemeral=True
+            )
         traceback.print_exception(type(error), error, error.__traceback__)
 
 
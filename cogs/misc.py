@@ -5,6 +5,7 @@ from datetime import datetime
 
 # Custom modules
 from modules import enums
+from modules.http_client import http_client
 
 
 class Misc(commands.Cog):
@@ -96,6 +97,23 @@ class Misc(commands.Cog):
             ephemeral=True,
         )
 
+    @app_commands.command(
+        name="http-stats", description="Latency of the bot's outgoing HTTP requests"
+    )
+    @app_commands.checks.has_any_role(enums.Roles.Administration.value)
+    async def http_stats(self, interaction: discord.Interaction):
+        embed = discord.Embed(title="HTTP stats", color=enums.EmbedStyle.Round.value)
+        for host, stats in http_client.stats().items():
+            embed.add_field(
+                name=host,
+                value=f"{stats['requests']} requests, {stats['errors']} errors\nAvg **{stats['avg_ms']} ms**, max {stats['max_ms']} ms",
+                inline=False,
+            )
+        if not embed.fields:
+            embed.description = "No requests made yet."
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(name="utc", description="See UTC time")
     async def utc(self, interaction: discord.Interaction):
         embed = discord.Embed(title="Time")
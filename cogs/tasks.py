@@ -60,6 +60,11 @@ class Tasks(commands.Cog):
 
         await self.bot.change_presence(activity=discord.Game(next(self.activity)))
 
+    @activityUpdate.before_loop
+    async def before_activityUpdate(self):
+        # Extensions load in setup_hook, before there is a gateway connection to set a presence on.
+        await self.bot.wait_until_ready()
+
 
 async def setup(bot):
     await bot.add_cog(Tasks(bot))
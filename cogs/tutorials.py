@@ -1,14 +1,16 @@
-import asyncio
-from json import load
+import hashlib
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
-from modules.enums import FileLocations
-
-with open(FileLocations.Modules.value, mode="r", encoding="utf-8") as f:
-    modules = load(f)
+from modules.enums import FileLocations, Roles
+from modules.dm_queue import DMQueue
+from modules.expiry import ExpiringResponses
+from modules.search_index import SearchIndex
 
 
 def make_human_readable_list(items: list[str]) -> str:
@@ -20,67 +22,283 @@ def make_human_readable_list(items: list[str]) -> str:
         return ", ".join(items[:-1]) + " and " + items[-1]
 
 
-class Tutorials(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
+class TutorialEntry(NamedTuple):
+    option: discord.SelectOption
+    embed: discord.Embed
+
+
+def build_entries(modules: dict) -> Dict[str, TutorialEntry]:
+    wip = modules.get("WIP", {})
+    entries = {}
+    for code, module in modules.items():
+        if code == "WIP":
+            continue
+
+        option = discord.SelectOption(
+            label=code,
+            description=module.get("description", None),
+            emoji=module.get("emoji", wip.get("emoji", None)),
+        )
 
-    @discord.ui.select(
-        placeholder="Select a module",
-        min_values=1,
-        max_values=1,
-        options=[
-            discord.SelectOption(
-                label=code,
-                description=module.get("description", None),
-                emoji=module.get("emoji", modules.get("WIP", {}).get("emoji", None)),
-            )
-            for code, module in modules.items()
-            if code != "WIP"
-        ],
-    )
-    async def on_select(
-        self, interaction: discord.Interaction, select: discord.ui.Select
-    ):
         embed = discord.Embed(
-            title=f"Tutorial for {select.values[0]}",
+            title=f"Tutorial for {code}",
             description="Here are some helpful tutorials/materials for this module",
             color=discord.Color.random(),
         )
-        embed_data = modules.get(select.values[0], {})
-        embed.set_image(url=embed_data.get("image"))
-        for field in embed_data.get("fields", modules.get("WIP", {}).get("fields", [])):
+        embed.set_image(url=module.get("image"))
+        for field in module.get("fields", wip.get("fields", [])):
             embed.add_field(
                 name=field.get("name", ""), value=field.get("value", ""), inline=True
             )
 
-        authors = make_human_readable_list(embed_data.get("authors", []))
-
+        authors = make_human_readable_list(module.get("authors", []))
         if authors:
             embed.set_footer(text=f"Tutorial resources created by: {authors}")
 
-        await interaction.response.defer()
-        user = interaction.user
-        await user.send(embed=embed)
+        entries[code] = TutorialEntry(option, embed)
+    return entries
+
+
+def module_group(code: str) -> str:
+    """"CO2101" -> "CO Year 2", from the department letters and the first digit of the code."""
+    department = code.rstrip("0123456789")
+    digits = code[len(department) :]
+    if not department or not digits:
+        return "Other"
+    return f"{department} Year {digits[0]}"
+
+
+class TutorialCatalogue:
+    """modules.json rendered once into a select option and embed per module, grouped and indexed for search.
+
+    refresh() rebuilds only when the file's mtime and content hash change, then swaps the whole catalogue in
+    one assignment, so a select never sees a half-built one. The embeds are shared, never edit them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, TutorialEntry] = {}
+        self.groups: Dict[str, List[str]] = {}
+        self.index = SearchIndex({})
+        self.mtime = None
+        self.digest = None
+
+    def refresh(self) -> bool:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self.mtime:
+            return False
+
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        self.mtime = mtime
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == self.digest:
+            return False
+
+        try:
+            entries = build_entries(json.loads(raw))
+        except (ValueError, AttributeError, TypeError) as error:
+            print(f"[Tutorials] Keeping the old catalogue, {self.path} is invalid: {error}")
+            return False
+
+        groups = {}
+        for code in entries:
+            groups.setdefault(module_group(code), []).append(code)
+        index = SearchIndex(
+            {code: entry.option.description or "" for code, entry in entries.items()}
+        )
+
+        self.entries, self.groups, self.index, self.digest = (
+            entries,
+            dict(sorted(groups.items())),
+            index,
+            digest,
+        )
+        return True
+
+    def ensure_loaded(self):
+        # modules.json is read on first use rather than at import, keeping cog startup cheap.
+        if self.mtime is None:
+            self.refresh()
+
+    def codes(self, group: Optional[str] = None) -> List[str]:
+        if group is None:
+            return list(self.entries)
+        return self.groups.get(group, [])
+
+    def options(self, codes: List[str]) -> List[discord.SelectOption]:
+        return [self.entries[code].option for code in codes if code in self.entries]
+
+    def get(self, code: str) -> Optional[discord.Embed]:
+        entry = self.entries.get(code)
+        return entry.embed if entry else None
+
+
+catalogue = TutorialCatalogue(FileLocations.Modules.value)
+
+dm_queue = DMQueue(closed_errors=(discord.Forbidden,))
+
+# Seconds before the /tutorial picker is deleted and its view stops listening.
+TUTORIAL_MESSAGE_TTL = 30
+expiring_responses = ExpiringResponses()
+
+# Discord allows at most 25 options in a select.
+PAGE_SIZE = 25
+# Select option values must be 1-100 characters, so "no filter" needs a value of its own.
+ALL_GROUPS = "all"
+
+
+async def send_tutorial(interaction: discord.Interaction, code: str, ephemeral: bool):
+    catalogue.ensure_loaded()
+    embed = catalogue.get(code)
+    if embed is None:
+        await interaction.response.send_message(
+            f"There are no tutorials for {code}.", ephemeral=True
+        )
+        return
+
+    await interaction.response.defer(ephemeral=ephemeral)
+    user = interaction.user
+    if await dm_queue.send(user, embed=embed):
+        await interaction.followup.send(
+            f"The material for {code} has been DM'd to you {user.mention}",
+            ephemeral=True,
+        )
+    else:
         await interaction.followup.send(
-            f"The material for {select.values[0]} has been DM'd to you {user.mention}",
+            f"I couldn't DM you, so here is the material for {code}. Open your DMs to get it there next time.",
+            embed=embed,
             ephemeral=True,
         )
 
 
+class Tutorials(discord.ui.View):
+    """One page of modules, optionally narrowed to a group, with group and page controls when they are needed."""
+
+    def __init__(self, group: Optional[str] = None, page: int = 0):
+        super().__init__(timeout=TUTORIAL_MESSAGE_TTL)
+        catalogue.ensure_loaded()
+        codes = catalogue.codes(group)
+        pages = max(1, -(-len(codes) // PAGE_SIZE))
+        self.group = group
+        self.page = min(max(page, 0), pages - 1)
+
+        start = self.page * PAGE_SIZE
+        self.on_select.options = catalogue.options(codes[start : start + PAGE_SIZE])
+        if pages > 1:
+            self.on_select.placeholder = f"Select a module (page {self.page + 1}/{pages})"
+
+        if len(catalogue.groups) > 1:
+            self.add_item(GroupSelect(group))
+        if pages > 1:
+            self.add_item(PageButton(group, self.page - 1, "◀", self.page == 0))
+            self.add_item(PageButton(group, self.page + 1, "▶", self.page == pages - 1))
+
+    @discord.ui.select(
+        placeholder="Select a module",
+        min_values=1,
+        max_values=1,
+        row=0,
+    )
+    async def on_select(
+        self, interaction: discord.Interaction, select: discord.ui.Select
+    ):
+        await send_tutorial(interaction, select.values[0], ephemeral=False)
+
+
+class GroupSelect(discord.ui.Select):
+    def __init__(self, group: Optional[str]):
+        options = [
+            discord.SelectOption(
+                label="All modules", value=ALL_GROUPS, default=group is None
+            )
+        ]
+        options += [
+            discord.SelectOption(label=name, value=name, default=name == group)
+            for name in list(catalogue.groups)[: PAGE_SIZE - 1]
+        ]
+        super().__init__(placeholder="Filter by year", options=options, row=1)
+
+    async def callback(self, interaction: discord.Interaction):
+        group = None if self.values[0] == ALL_GROUPS else self.values[0]
+        await interaction.response.edit_message(view=Tutorials(group=group))
+
+
+class PageButton(discord.ui.Button):
+    def __init__(self, group: Optional[str], page: int, label: str, disabled: bool):
+        super().__init__(
+            label=label, style=discord.ButtonStyle.gray, disabled=disabled, row=2
+        )
+        self.group = group
+        self.page = page
+
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.response.edit_message(
+            view=Tutorials(group=self.group, page=self.page)
+        )
+
+
 class TutorialCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        self.watch_catalogue.start()
+
+    async def cog_unload(self):
+        self.watch_catalogue.cancel()
+        await expiring_responses.close()
+        await dm_queue.close()
+
+    @tasks.loop(seconds=30)
+    async def watch_catalogue(self):
+        if catalogue.refresh():
+            print(f"[Tutorials] Reloaded {len(catalogue.entries)} modules.")
+
     @app_commands.command(
         name="tutorial", description="Select a module to view tutorials"
     )
-    async def tutorial(self, interaction: discord.Interaction):
+    @app_commands.describe(code="Module code, e.g. CO1101")
+    async def tutorial(
+        self, interaction: discord.Interaction, code: Optional[str] = None
+    ):
+        if code:
+            await send_tutorial(interaction, code.strip().upper(), ephemeral=True)
+            return
+
         await interaction.response.defer()
         await interaction.followup.send(
             "Select a module from the dropdown below:", view=Tutorials(), ephemeral=True
         )
-        await asyncio.sleep(30)
-        await interaction.delete_original_response()
+        expiring_responses.add(interaction, TUTORIAL_MESSAGE_TTL)
+
+    @app_commands.command(
+        name="tutorial-stats", description="Tutorial DM delivery stats."
+    )
+    @app_commands.checks.has_any_role(Roles.Administration.value)
+    async def tutorial_stats(self, interaction: discord.Interaction):
+        stats = dm_queue.stats()
+        await interaction.response.send_message(
+            f"**{stats['sent']}** DMs sent, {stats['failed']} failed, {stats['queued']} queued.\n"
+            f"{stats['closed_cached']} users with closed DMs cached, {stats['closed_skips']} sends skipped.\n"
+            f"Latency: avg {stats['avg_latency_ms']} ms, max {stats['max_latency_ms']} ms.",
+            ephemeral=True,
+        )
+
+    @tutorial.autocomplete("code")
+    async def tutorial_code_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        catalogue.ensure_loaded()
+        choices = []
+        for code in catalogue.index.search(current):
+            description = catalogue.entries[code].option.description
+            name = f"{code} - {description}" if description else code
+            choices.append(app_commands.Choice(name=name[:100], value=code))
+        return choices
 
 
 async def setup(bot: commands.Bot):
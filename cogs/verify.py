@@ -1,23 +1,39 @@
+import asyncio
+import csv
+import io
 import traceback
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands, ui
+from discord.app_commands import Choice
 import random
 import re
 from datetime import datetime, timedelta
 import time
-import json
 import os
+from typing import List, Optional
 
 # Custom modules
 from modules import enums
-from modules.utils import ensure_json_exists
-
-from mailjet_rest import Client
-from dotenv import load_dotenv
-from cogs.minecraft import unwhitelist_account, unwhitelist_pipeline
-
-load_dotenv()
+from modules.store import (
+    verify_store,
+    mc_store,
+    banned_store,
+    pending_store,
+    normalise_ban,
+    valid_ban,
+)
+from modules.mailer import EmailDispatcher
+from modules.expiry import ExpiryScheduler
+from modules import bulk
+from modules.sessions import CodeCheck, SessionManager
+from modules.ratelimit import RateLimiter, parse_limit
+
+from cogs.minecraft import (
+    unwhitelist_account,
+    unwhitelist_pipeline,
+    whitelist_batcher,
+)
 
 verified_role_id = int(os.getenv("VERIFIED_ROLE_ID"))
 dmu_verified_role_id = int(os.getenv("DMU_VERIFIED_ROLE_ID"))
@@ -28,9 +44,32 @@ general_channel_id = int(os.getenv("GENERAL_CHANNEL_ID"))
 api_key = os.getenv("MAIL_JET_KEY")
 api_secret = os.getenv("MAIL_JET_SECRET")
 
-mailjet = None
+mailer = None
 if api_key and api_secret:
-    mailjet = Client(auth=(api_key, api_secret), version="v3.1")
+    mailer = EmailDispatcher(api_key, api_secret)
+
+# Expiry sweep: concurrent role edits, users handled per chunk, and how long to wait before retrying a failed chunk.
+CLEANUP_CONCURRENCY = 5
+CLEANUP_CHUNK_SIZE = 100
+CLEANUP_RETRY_DELAY = 3600
+
+expiry_scheduler = ExpiryScheduler()
+
+# Pending verification codes: valid for 15 minutes, 5 guesses each.
+SESSION_TTL = 15 * 60
+verification_sessions = SessionManager(
+    ttl=SESSION_TTL, max_attempts=5, store=pending_store
+)
+
+# Verification emails allowed as "count/seconds" per user, per address, per uni domain and in total.
+email_limiter = RateLimiter(
+    {
+        "user": parse_limit(os.getenv("VERIFY_LIMIT_USER") or "3/600"),
+        "email": parse_limit(os.getenv("VERIFY_LIMIT_EMAIL") or "3/600"),
+        "domain": parse_limit(os.getenv("VERIFY_LIMIT_DOMAIN") or "120/60"),
+        "total": parse_limit(os.getenv("VERIFY_LIMIT_TOTAL") or "200/60"),
+    }
+)
 
 regex = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b"
 
@@ -47,36 +86,28 @@ welcome_messages = [
 ]
 
 
-def sendEmail(email, code):
+async def sendEmail(email, code):
     formatCode = "{:05d}".format(code)
 
-    data = {
-        "Messages": [
+    message = {
+        "From": {
+            "Email": "auth@tweakified.co.uk",
+            "Name": "Verification Email",
+        },
+        "To": [
             {
-                "From": {
-                    "Email": "auth@tweakified.co.uk",
-                    "Name": "Verification Email",
-                },
-                "To": [
-                    {
-                        "Email": email,
-                    }
-                ],
-                "Subject": "Verification Email",
-                "TextPart": "Hi,\n\nBelow is your verification code, please enter it in the Discord field: "
-                + formatCode
-                + "\n\nKind Regards,\nLeicester Computer Science Society.",
+                "Email": email,
             }
-        ]
+        ],
+        "Subject": "Verification Email",
+        "TextPart": "Hi,\n\nBelow is your verification code, please enter it in the Discord field: "
+        + formatCode
+        + "\n\nKind Regards,\nLeicester Computer Science Society.",
     }
-    result = mailjet.send.create(data=data)
-    return result
+    return await mailer.send(message)
 
 
 async def verificationRequest(interaction):
-    with open(enums.FileLocations.Verify.value, "r", encoding="utf-8") as f:
-        verify_data = json.load(f)
-
     discord_id = str(interaction.user.id)
 
     roles = interaction.user.roles
@@ -84,7 +115,7 @@ async def verificationRequest(interaction):
         role.id in (verified_role_id, dmu_verified_role_id) for role in roles
     )
 
-    if has_verify_role and discord_id in verify_data:
+    if has_verify_role and await verify_store.has(discord_id):
         await interaction.response.send_message(
             "You have already verified!", ephemeral=True
         )
@@ -95,14 +126,8 @@ async def verificationRequest(interaction):
 
 
 async def unverify_account(interaction: discord.Interaction, discord_id: str):
-    with open(enums.FileLocations.Verify.value, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    if discord_id in data:
-        data.pop(discord_id, None)
-
-        with open(enums.FileLocations.Verify.value, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+    await verify_store.pop(discord_id)
+    expiry_scheduler.cancel(discord_id)
 
     await unwhitelist_account(interaction, discord_id, False)
 
@@ -123,14 +148,32 @@ async def unverify_account(interaction: discord.Interaction, discord_id: str):
 class Verify(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        ensure_json_exists(enums.FileLocations.Verify.value)
-        ensure_json_exists(enums.FileLocations.Banned.value, [])
         print(f"{__name__} cog loaded.")
-        self.cleanup_task.start()
         bot.add_view(Verify_buttons())
+        bot.add_view(Ready_buttons(timeout=None))
+
+    async def cog_load(self):
+        # Read the data files off the event loop. The mailer starts itself on the first email.
+        await asyncio.gather(
+            asyncio.to_thread(verify_store.load),
+            asyncio.to_thread(banned_store.load),
+            asyncio.to_thread(pending_store.load),
+        )
+        verification_sessions.load()
 
-    def cog_unload(self):
-        self.cleanup_task.cancel()
+        expiry_scheduler.load(
+            (discord_id, entry.get("expires"))
+            for discord_id, entry in await verify_store.items()
+        )
+        expiry_scheduler.start(self.sweep)
+
+    async def cog_unload(self):
+        expiry_scheduler.stop()
+        verify_store.flush()
+        banned_store.flush()
+        pending_store.flush()
+        if mailer:
+            await mailer.close()
 
     @app_commands.command(name="verify", description="Server verification")
     async def verify(self, interaction: discord.Interaction):
@@ -207,32 +250,30 @@ class Verify(commands.Cog):
 
     @app_commands.checks.has_any_role(enums.Roles.Management.value)
     @app_commands.command(name="ban", description="Ban a student email from verifying.")
+    @app_commands.describe(
+        email="An email, a domain (*@example.com) or a prefix (spam*@student.le.ac.uk)"
+    )
     async def ban(self, interaction: discord.Interaction, email: str):
-        with open(enums.FileLocations.Banned.value, "r", encoding="utf-8") as f:
-            banned_data = json.load(f)
+        email = normalise_ban(email)
 
-        email = email.strip().lower()
+        if not valid_ban(email):
+            await interaction.response.send_message(
+                f"`{email}` is not a valid email or pattern. Use an email, `*@example.com`, "
+                "`*@*.example.com` or a prefix such as `spam*@student.le.ac.uk`.",
+                ephemeral=True,
+            )
+            return
 
-        if email in [e.lower() for e in banned_data]:
+        if not banned_store.add(email):
             await interaction.response.send_message(
                 f"The email `{email}` is already banned.",
                 ephemeral=True,
             )
             return
 
-        banned_data.append(email)
-
-        with open(enums.FileLocations.Banned.value, "w", encoding="utf-8") as f:
-            json.dump(banned_data, f, indent=4)
-
-        with open(enums.FileLocations.Verify.value, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
         discord_id = None
-        for did, entry in data.items():
-            if entry.get("email", "").lower() == email:
-                discord_id = did
-                break
+        if "*" not in email:
+            discord_id = await verify_store.find_by_email(email)
 
         if discord_id:
             await unverify_account(interaction, discord_id)
@@ -242,52 +283,208 @@ class Verify(commands.Cog):
             ephemeral=True,
         )
 
-    @tasks.loop(hours=24)
-    async def cleanup_task(self):
-        current_time = int(time.time())
-        removed = []
+    @app_commands.command(
+        name="bulk-import",
+        description="Import verify, Minecraft or banned records from a CSV/JSONL file.",
+    )
+    @app_commands.choices(
+        dataset=[Choice(name=name, value=name) for name in bulk.DATASETS]
+    )
+    @app_commands.checks.has_any_role(enums.Roles.Administration.value)
+    async def bulk_import(
+        self,
+        interaction: discord.Interaction,
+        dataset: Choice[str],
+        file: discord.Attachment,
+    ):
+        await interaction.response.defer(ephemeral=True)
 
-        with open(enums.FileLocations.Verify.value, "r", encoding="utf-8") as f:
-            verify_data = json.load(f)
-        with open(enums.FileLocations.MCData.value, "r", encoding="utf-8") as f:
-            mc_data = json.load(f)
+        fmt = "jsonl" if file.filename.lower().endswith(".jsonl") else "csv"
+        lines = io.StringIO((await file.read()).decode("utf-8-sig"))
+        try:
+            result = await bulk.import_rows(
+                dataset.value, bulk.read_rows(lines, fmt)
+            )
+        except (ValueError, csv.Error) as error:
+            await interaction.followup.send(
+                f":x: Could not read `{file.filename}`: {error}", ephemeral=True
+            )
+            return
 
-        guild = self.bot.get_guild(enums.Guild.LeicesterCS.value)
+        if result["errors"]:
+            errors = "\n".join(result["errors"])
+            await interaction.followup.send(
+                f":x: Nothing was imported, fix these rows and try again:\n```{errors[:1800]}```",
+                ephemeral=True,
+            )
+            return
 
-        for discord_id, entry in list(verify_data.items()):
-            if entry.get("expires") and current_time > entry["expires"]:
-                removed.append(discord_id)
-                verify_data.pop(discord_id, None)
+        note = ""
+        if dataset.value == "verify":
+            for discord_id, _, expires in result["records"]:
+                expiry_scheduler.schedule(discord_id, expires)
+        elif dataset.value == "minecraft" and result["records"]:
+            whitelisted = await asyncio.gather(
+                *(whitelist_batcher.add(u) for _, u in result["records"])
+            )
+            if not all(whitelisted):
+                note = "\n:warning: Some accounts could not be whitelisted on the server."
 
-                removed_usernames = mc_data.pop(discord_id, [])
+        await interaction.followup.send(
+            f":white_check_mark: Imported **{result['imported']}** of {result['rows']} {dataset.value} rows "
+            f"in {result['seconds']:.2f}s ({result['rows_per_second']} rows/s).{note}",
+            ephemeral=True,
+        )
 
-                member = guild.get_member(int(discord_id))
-                if member:
-                    roleIds = [
-                        verified_role_id,
-                        dmu_verified_role_id,
-                        mc_whitelisted_role_id,
-                    ]
-                    roles_to_remove = [
-                        role for role in member.roles if role.id in roleIds
-                    ]
+    @app_commands.command(
+        name="bulk-export",
+        description="Export verify, Minecraft or banned records as CSV/JSONL.",
+    )
+    @app_commands.choices(
+        dataset=[Choice(name=name, value=name) for name in bulk.DATASETS],
+        fmt=[Choice(name=name, value=name) for name in bulk.FORMATS],
+    )
+    @app_commands.rename(fmt="format")
+    @app_commands.checks.has_any_role(enums.Roles.Administration.value)
+    async def bulk_export(
+        self,
+        interaction: discord.Interaction,
+        dataset: Choice[str],
+        fmt: Choice[str],
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        started = time.perf_counter()
+        rows = await bulk.export_rows(dataset.value)
+        out = io.StringIO()
+        bulk.write_rows(rows, fmt.value, dataset.value, out)
+        seconds = time.perf_counter() - started
+
+        await interaction.followup.send(
+            f":outbox_tray: Exported **{len(rows)}** {dataset.value} rows in {seconds:.2f}s.",
+            file=discord.File(
+                io.BytesIO(out.getvalue().encode("utf-8")),
+                filename=f"{dataset.value}.{fmt.value}",
+            ),
+            ephemeral=True,
+        )
 
-                    if roles_to_remove:
-                        await member.remove_roles(*roles_to_remove)
+    @app_commands.command(
+        name="verify-stats", description="Pending verifications and email delivery."
+    )
+    @app_commands.checks.has_any_role(enums.Roles.Administration.value)
+    async def verify_stats(self, interaction: discord.Interaction):
+        sessions = verification_sessions.stats()
+        embed = discord.Embed(title="Verification stats", color=enums.EmbedStyle.Round.value)
+        embed.add_field(
+            name="Sessions",
+            value=f"**{sessions['live']}** live\n{sessions['started']} started, {sessions['replaced']} replaced\n"
+            f"{sessions['completed']} completed, {sessions['locked']} locked, {sessions['evicted']} expired",
+            inline=False,
+        )
+        if mailer:
+            emails = mailer.stats()
+            embed.add_field(
+                name="Emails",
+                value=f"{emails['queued']} queued, {emails['sent']} sent, {emails['failed']} failed\n"
+                f"{emails['messages_per_request']} per request, avg {emails['avg_delivery_ms']} ms",
+                inline=False,
+            )
+        limits = email_limiter.stats()
+        embed.add_field(
+            name="Rate limits",
+            value=f"{limits['allowed']} allowed\n"
+            + ", ".join(f"{scope}: {n} rejected" for scope, n in limits["rejected"].items()),
+            inline=False,
+        )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    async def sweep(self, discord_ids: List[str]):
+        """Called by the expiry scheduler with the users whose verification just expired."""
+        # The scheduler has already forgotten these ids, so any that are not removed below
+        # must be scheduled again or they would stay verified until the next restart.
+        unsettled = dict.fromkeys(discord_ids)
+        try:
+            await self.bot.wait_until_ready()
+
+            # The same comparison as ExpiryScheduler.pop_due, so a record the scheduler
+            # considers due is never skipped here. Early ones go back on the schedule.
+            now = time.time()
+            expired = []
+            for discord_id in discord_ids:
+                entry = await verify_store.get(discord_id)
+                if not entry or not entry.get("expires"):
+                    unsettled.pop(discord_id)
+                elif entry["expires"] < now:
+                    expired.append(discord_id)
+                else:
+                    expiry_scheduler.schedule(discord_id, entry["expires"])
+                    unsettled.pop(discord_id)
+            if expired:
+                await self.remove_expired(expired, unsettled)
+        finally:
+            retry_at = int(time.time()) + CLEANUP_RETRY_DELAY
+            for discord_id in unsettled:
+                expiry_scheduler.schedule(discord_id, retry_at)
+
+    async def remove_expired(self, expired: List[str], unsettled: dict):
+        guild = self.bot.get_guild(enums.Guild.LeicesterCS.value)
+        semaphore = asyncio.Semaphore(CLEANUP_CONCURRENCY)
+        started = time.perf_counter()
+        removed = 0
+
+        # Records are only deleted once their chunk is fully processed, so an interrupted
+        # sweep leaves the rest expired and the next run picks up where this one stopped.
+        for i in range(0, len(expired), CLEANUP_CHUNK_SIZE):
+            chunk = expired[i : i + CLEANUP_CHUNK_SIZE]
 
-                if removed_usernames:
-                    await unwhitelist_pipeline(removed_usernames)
+            await asyncio.gather(
+                *(self.remove_expired_roles(guild, d, semaphore) for d in chunk)
+            )
+
+            usernames = [u for d in chunk for u in await mc_store.get(d)]
+            if usernames and not await unwhitelist_pipeline(usernames):
+                print(
+                    f"[Cleanup] Failed to unwhitelist {len(usernames)} accounts, retrying in {CLEANUP_RETRY_DELAY}s."
+                )
+                continue
 
-        with open(enums.FileLocations.Verify.value, "w", encoding="utf-8") as f:
-            json.dump(verify_data, f, indent=4)
-        with open(enums.FileLocations.MCData.value, "w", encoding="utf-8") as f:
-            json.dump(mc_data, f, indent=4)
+            for discord_id in chunk:
+                await verify_store.pop(discord_id)
+                await mc_store.pop(discord_id)
+                unsettled.pop(discord_id)
+
+            removed += len(chunk)
+            print(
+                f"[Cleanup] {removed}/{len(expired)} expired entries removed ({time.perf_counter() - started:.1f}s)."
+            )
 
         if removed:
             print(
-                f"[Cleanup] Removed {len(removed)} expired verification entries and their roles/accounts."
+                f"[Cleanup] Removed {removed} expired verification entries and their roles/accounts in {time.perf_counter() - started:.1f}s."
             )
 
+    async def remove_expired_roles(
+        self, guild: discord.Guild, discord_id: str, semaphore: asyncio.Semaphore
+    ):
+        member = guild.get_member(int(discord_id)) if guild else None
+        if not member:
+            return
+
+        roleIds = [verified_role_id, dmu_verified_role_id, mc_whitelisted_role_id]
+        roles_to_remove = [role for role in member.roles if role.id in roleIds]
+        if not roles_to_remove:
+            return
+
+        # One member edit per user instead of one request per role. discord.py waits out
+        # rate limit buckets itself, the semaphore just stops a cohort flooding the queue.
+        async with semaphore:
+            try:
+                await member.remove_roles(*roles_to_remove, atomic=False)
+            except discord.HTTPException as error:
+                print(f"[Cleanup] Failed to remove roles from {discord_id}: {error}")
+
 
 class EmailModal(discord.ui.Modal, title="Enter Uni Email"):
     email = discord.ui.TextInput(
@@ -315,10 +512,17 @@ class EmailModal(discord.ui.Modal, title="Enter Uni Email"):
             )
             return
 
-        with open(enums.FileLocations.Banned.value, "r", encoding="utf-8") as f:
-            banned_data = json.load(f)
+        retry_after = email_limiter.acquire(
+            user=interaction.user.id, email=email, domain=domain, total=None
+        )
+        if retry_after is not None:
+            await interaction.response.send_message(
+                f"You're requesting codes too quickly. Please try again <t:{int(time.time() + retry_after) + 1}:R>.",
+                ephemeral=True,
+            )
+            return
 
-        if email in [b.lower() for b in banned_data]:
+        if email in banned_store:
             await interaction.response.send_message(
                 "❌ This email is banned from verifying. "
                 "If you believe this is a mistake, or would like to appeal please contact a member of the committee.",
@@ -326,27 +530,44 @@ class EmailModal(discord.ui.Modal, title="Enter Uni Email"):
             )
             return
 
+        await interaction.response.send_message(
+            ":incoming_envelope: Sending your verification email...", ephemeral=True
+        )
+
         code = random.randint(0, 99999)
-        result = sendEmail(email, code)
+        try:
+            delivered = await sendEmail(email, code)
+        except asyncio.QueueFull:
+            await interaction.edit_original_response(
+                content="We're sending a lot of verification emails right now. Please try again in a minute."
+            )
+            return
 
-        if result.status_code != 200:
-            await interaction.response.send_message(
-                "Oops! Something went wrong.", ephemeral=True
+        if not delivered:
+            await interaction.edit_original_response(
+                content="Oops! Something went wrong."
             )
             return
 
-        await interaction.response.send_message(
-            ":thumbsup: An email has been sent to the address you entered. **Please check your junk mail**.\nPress the button when you have the code.",
-            view=Ready_buttons(code, email, domain, self.send_welcome),
-            ephemeral=True,
+        verification_sessions.start(
+            interaction.user.id, email, domain, code, self.send_welcome
+        )
+        await interaction.edit_original_response(
+            content=":thumbsup: An email has been sent to the address you entered. **Please check your junk mail**.\nPress the button when you have the code.",
+            view=Ready_buttons(),
         )
 
     async def on_error(
         self, interaction: discord.Interaction, error: Exception
     ) -> None:
-        await interaction.response.send_message(
-            "Oops! Something went wrong.", ephemeral=True
-        )
+        if interaction.response.is_done():
+            await interaction.edit_original_response(
+                content="Oops! Something went wrong.", view=None
+            )
+        else:
+            await interaction.response.send_message(
+                "Oops! Something went wrong.", ephemeral=True
+            )
         traceback.print_exception(type(error), error, error.__traceback__)
 
 
@@ -426,29 +647,31 @@ class Verify_buttons(ui.View):
 
 
 class Ready_buttons(ui.View):
-    def __init__(self, code, email, domain, send_welcome):
-        super().__init__(timeout=None)
-        self.codeSent = code
-        self.email = email
-        self.domain = domain
-        self.send_welcome = send_welcome
+    """The pending code is looked up by user ID, so the button works from any instance of this view.
+
+    Each message gets one that expires with the session. A single persistent instance registered in the cog
+    catches clicks on messages sent before a restart.
+    """
+
+    def __init__(self, timeout: Optional[float] = SESSION_TTL):
+        super().__init__(timeout=timeout)
 
     @discord.ui.button(
         label="I Have It", style=discord.ButtonStyle.green, custom_id="ready"
     )
     async def verify_button(self, interaction: discord.Interaction, button: ui.Button):
-        await interaction.response.send_modal(
-            CodeModal(self.codeSent, self.email, self.domain, self.send_welcome)
-        )
+        if verification_sessions.get(interaction.user.id) is None:
+            await interaction.response.send_message(
+                "Your code has expired. Please run `/verify` again.", ephemeral=True
+            )
+            return
+
+        await interaction.response.send_modal(CodeModal())
 
 
 class CodeModal(discord.ui.Modal, title="Enter the Code"):
-    def __init__(self, code, email, domain, send_welcome):
-        super().__init__(timeout=None)
-        self.codeSent = code
-        self.email = email
-        self.domain = domain
-        self.send_welcome = send_welcome
+    def __init__(self):
+        super().__init__(timeout=SESSION_TTL)
 
     code = discord.ui.TextInput(
         label="Code",
@@ -456,24 +679,32 @@ class CodeModal(discord.ui.Modal, title="Enter the Code"):
     )
 
     async def on_submit(self, interaction: discord.Interaction):
-        code = int(self.code.value)
-        if code != int(self.codeSent):
+        result, session = verification_sessions.check(
+            interaction.user.id, self.code.value
+        )
+        if result == CodeCheck.EXPIRED:
+            await interaction.response.send_message(
+                "Your code has expired. Please run `/verify` again.", ephemeral=True
+            )
+            return
+        if result == CodeCheck.LOCKED:
+            await interaction.response.send_message(
+                "Too many wrong codes. Please run `/verify` again to get a new one.",
+                ephemeral=True,
+            )
+            return
+        if result == CodeCheck.WRONG:
             await interaction.response.send_message(
                 "Oops! You entered the wrong code", ephemeral=True
             )
             return
 
-        with open(enums.FileLocations.Verify.value, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
         expiry_time = int((datetime.utcnow() + timedelta(days=365)).timestamp())
-        data[str(interaction.user.id)] = {"email": self.email, "expires": expiry_time}
-
-        with open(enums.FileLocations.Verify.value, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        await verify_store.set(str(interaction.user.id), session.email, expiry_time)
+        expiry_scheduler.schedule(str(interaction.user.id), expiry_time)
 
         roleId = verified_role_id
-        if self.domain == "dmu.ac.uk":
+        if session.domain == "dmu.ac.uk":
             roleId = dmu_verified_role_id
         role = interaction.guild.get_role(roleId)
 
@@ -482,7 +713,7 @@ class CodeModal(discord.ui.Modal, title="Enter the Code"):
             f"You were given the <@&{str(roleId)}> role", ephemeral=True
         )
 
-        if self.send_welcome:
+        if session.send_welcome:
             general_channel = interaction.guild.get_channel(general_channel_id)
             if general_channel:
                 message = random.choice(welcome_messages).format(
@@ -524,11 +755,6 @@ class LookupModal(discord.ui.Modal, title="Lookup User Data"):
         self.interaction = interaction
 
     async def on_submit(self, interaction: discord.Interaction):
-        with open(enums.FileLocations.Verify.value, "r", encoding="utf-8") as f:
-            verify_data = json.load(f)
-        with open(enums.FileLocations.MCData.value, "r", encoding="utf-8") as f:
-            mc_data = json.load(f)
-
         discord_id = None
         if self.discord_account.value:
             match = re.findall(r"\d{17,19}", self.discord_account.value)
@@ -536,20 +762,15 @@ class LookupModal(discord.ui.Modal, title="Lookup User Data"):
                 discord_id = match[0]
 
         if self.mc_account.value:
-            username_lower = self.mc_account.value.strip().lower()
-            for did, usernames in mc_data.items():
-                if username_lower in [u.lower() for u in usernames]:
-                    discord_id = did
-                    break
+            discord_id = (
+                await mc_store.find_by_username(self.mc_account.value) or discord_id
+            )
 
         if self.student_email.value:
-            for did, entry in verify_data.items():
-                if (
-                    entry.get("email", "").lower()
-                    == self.student_email.value.strip().lower()
-                ):
-                    discord_id = did
-                    break
+            discord_id = (
+                await verify_store.find_by_email(self.student_email.value)
+                or discord_id
+            )
 
         if not discord_id:
             await interaction.response.send_message(
@@ -557,8 +778,8 @@ class LookupModal(discord.ui.Modal, title="Lookup User Data"):
             )
             return
 
-        email = verify_data.get(discord_id, {}).get("email", "Not found")
-        mc_accounts = mc_data.get(discord_id, [])
+        email = (await verify_store.get(discord_id) or {}).get("email", "Not found")
+        mc_accounts = await mc_store.get(discord_id)
         member = interaction.guild.get_member(int(discord_id))
         discord_user = member.mention if member else f"Unknown User ({discord_id})"
 
@@ -0,0 +1,145 @@
+import asyncio
+import csv
+import io
+import json
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List
+
+from modules.store import (
+    EMAIL_PATTERN,
+    banned_store,
+    mc_store,
+    normalise_ban,
+    valid_ban,
+    verify_store,
+)
+
+DATASETS = {
+    "verify": ("discord_id", "email", "expires"),
+    "minecraft": ("discord_id", "username"),
+    "banned": ("email",),
+}
+FORMATS = ("csv", "jsonl")
+
+CHUNK_SIZE = 1000
+# Stop collecting errors after this many, the file is clearly wrong by then.
+MAX_ERRORS = 20
+
+DISCORD_ID_PATTERN = re.compile(r"^\d{17,20}$")
+MC_USERNAME_PATTERN = re.compile(r"^[a-zA-Z0-9_]{2,16}$")
+
+
+def read_rows(lines: Iterable[str], fmt: str) -> Iterator[dict]:
+    """Stream rows from CSV (with a header line) or JSON Lines."""
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+    else:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_rows(rows: Iterable[dict], fmt: str, dataset: str, out: io.TextIOBase):
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=DATASETS[dataset])
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+
+
+def validate_row(dataset: str, row: dict, seen: set, default_expires: int) -> tuple:
+    """Return the cleaned row for the store, or raise ValueError."""
+    if dataset == "banned":
+        email = normalise_ban(str(row.get("email") or ""))
+        if not valid_ban(email):
+            raise ValueError(f"invalid email or pattern {email!r}")
+        return (email,)
+
+    discord_id = str(row.get("discord_id") or "").strip()
+    if not DISCORD_ID_PATTERN.match(discord_id):
+        raise ValueError(f"invalid discord_id {discord_id!r}")
+
+    if dataset == "minecraft":
+        username = str(row.get("username") or "").strip()
+        if not MC_USERNAME_PATTERN.match(username):
+            raise ValueError(f"invalid Minecraft username {username!r}")
+        if username.lower() in seen:
+            raise ValueError(f"duplicate Minecraft username {username!r}")
+        seen.add(username.lower())
+        return (discord_id, username)
+
+    email = str(row.get("email") or "").strip().lower()
+    if not EMAIL_PATTERN.match(email):
+        raise ValueError(f"invalid email {email!r}")
+    if email in banned_store:
+        raise ValueError(f"email {email!r} is banned")
+    if discord_id in seen:
+        raise ValueError(f"duplicate discord_id {discord_id!r}")
+    seen.add(discord_id)
+
+    expires = row.get("expires")
+    expires = int(expires) if expires not in (None, "") else default_expires
+    return (discord_id, email, expires)
+
+
+async def import_rows(dataset: str, rows: Iterable[dict]) -> dict:
+    """Validate every row in chunks, then apply them all at once. Nothing is applied if any row is invalid."""
+    started = time.perf_counter()
+    default_expires = int((datetime.utcnow() + timedelta(days=365)).timestamp())
+    valid, errors, seen = [], [], set()
+    total = 0
+
+    for line, row in enumerate(rows, start=1):
+        total += 1
+        try:
+            cleaned = validate_row(dataset, row, seen, default_expires)
+            if dataset == "minecraft" and await mc_store.find_by_username(cleaned[1]):
+                raise ValueError(f"Minecraft username {cleaned[1]!r} is already whitelisted")
+            valid.append(cleaned)
+        except (ValueError, TypeError, AttributeError) as error:
+            errors.append(f"row {line}: {error}")
+            if len(errors) >= MAX_ERRORS:
+                break
+
+        if total % CHUNK_SIZE == 0:
+            await asyncio.sleep(0)
+
+    imported = 0
+    if not errors:
+        if dataset == "verify":
+            await verify_store.bulk_set(valid)
+            imported = len(valid)
+        elif dataset == "minecraft":
+            await mc_store.bulk_add(valid)
+            imported = len(valid)
+        else:
+            imported = banned_store.bulk_add([row[0] for row in valid])
+
+    seconds = time.perf_counter() - started
+    return {
+        "rows": total,
+        "imported": imported,
+        "records": valid if not errors else [],
+        "errors": errors,
+        "seconds": seconds,
+        "rows_per_second": round(total / seconds) if seconds else total,
+    }
+
+
+async def export_rows(dataset: str) -> List[dict]:
+    if dataset == "verify":
+        return [
+            {"discord_id": d, "email": e.get("email", ""), "expires": e.get("expires")}
+            for d, e in await verify_store.items()
+        ]
+    if dataset == "minecraft":
+        return [
+            {"discord_id": d, "username": u}
+            for d, usernames in await mc_store.items()
+            for u in usernames
+        ]
+    return [{"email": entry} for entry in banned_store.entries()]
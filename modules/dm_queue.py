@@ -0,0 +1,144 @@
+import asyncio
+import time
+import traceback
+import weakref
+from collections import OrderedDict
+from typing import Tuple, Type
+
+
+class DMQueue:
+    """Delivers direct messages from a bounded queue with a few workers.
+
+    Every DM channel is its own rate limit route, so sends to one user run one at a time while different users
+    are served in parallel. Users whose DMs turned out to be closed are remembered for `closed_ttl` seconds and
+    fail straight away instead of costing another request.
+    """
+
+    def __init__(
+        self,
+        closed_errors: Tuple[Type[BaseException], ...],
+        workers: int = 4,
+        queue_size: int = 500,
+        closed_ttl: float = 3600,
+        max_closed: int = 10000,
+    ):
+        self.closed_errors = closed_errors
+        self.workers = workers
+        self.queue_size = queue_size
+        self.closed_ttl = closed_ttl
+        self.max_closed = max_closed
+
+        self.queue = None
+        self._loop = None
+        self._tasks = []
+        self._locks = weakref.WeakValueDictionary()
+        self.closed = OrderedDict()
+
+        self.sent = 0
+        self.failed = 0
+        self.closed_skips = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        if self.queue is None or self._loop is not loop:
+            self._loop = loop
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self.queue is not None:
+            while not self.queue.empty():
+                _, _, future, _ = self.queue.get_nowait()
+                if not future.done():
+                    future.set_result(False)
+            self.queue = None
+
+    def dms_closed(self, user_id: int) -> bool:
+        expires = self.closed.get(user_id)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self.closed[user_id]
+            return False
+        return True
+
+    def _mark_closed(self, user_id: int):
+        self.closed.pop(user_id, None)
+        self.closed[user_id] = time.monotonic() + self.closed_ttl
+        while len(self.closed) > self.max_closed:
+            self.closed.popitem(last=False)
+
+    async def send(self, user, **kwargs) -> bool:
+        """Queue a DM and wait for it. False if the user's DMs are closed, the queue is full or sending failed."""
+        if self.dms_closed(user.id):
+            self.closed_skips += 1
+            return False
+
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((user, kwargs, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.failed += 1
+            return False
+        return await future
+
+    async def _worker(self):
+        while True:
+            user, kwargs, future, queued_at = await self.queue.get()
+            try:
+                delivered = await self._deliver(user, kwargs)
+            except asyncio.CancelledError:
+                # Closing mid-send: this item is off the queue already, so close() can't resolve it.
+                if not future.done():
+                    future.set_result(False)
+                raise
+            finally:
+                self.queue.task_done()
+
+            if delivered:
+                latency = time.perf_counter() - queued_at
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+            if not future.done():
+                future.set_result(delivered)
+
+    async def _deliver(self, user, kwargs) -> bool:
+        lock = self._locks.get(user.id)
+        if lock is None:
+            lock = self._locks[user.id] = asyncio.Lock()
+
+        async with lock:
+            try:
+                await user.send(**kwargs)
+            except self.closed_errors:
+                self._mark_closed(user.id)
+                self.failed += 1
+                return False
+            except Exception as error:
+                self.failed += 1
+                traceback.print_exception(type(error), error, error.__traceback__)
+                return False
+
+        self.sent += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "closed_skips": self.closed_skips,
+            "closed_cached": len(self.closed),
+            "avg_latency_ms": round(self.total_latency / self.sent * 1000, 1)
+            if self.sent
+            else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+        }
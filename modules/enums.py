@@ -38,6 +38,10 @@ class FileLocations(Enum):
     MCData = os.path.join(BASE_DIR, "..", "data", "minecraft.json")
     Verify = os.path.join(BASE_DIR, "..", "data", "verify.json")
     Banned = os.path.join(BASE_DIR, "..", "data", "banned.json")
+    Pending = os.path.join(BASE_DIR, "..", "data", "pending.json")
+    PendingSecret = os.path.join(BASE_DIR, "..", "data", ".pending_secret")
+    TrelloSync = os.path.join(BASE_DIR, "..", "data", "trello_sync.json")
+    Database = os.path.join(BASE_DIR, "..", "data", "leicestercs.db")
 
 
 # COLOURS (HEX)
@@ -0,0 +1,124 @@
+import asyncio
+import heapq
+import itertools
+import time
+import traceback
+
+# Never sleep longer than this in one go, so a changed system clock is picked up.
+MAX_SLEEP = 3600
+
+
+class ExpiryScheduler:
+    """Keeps (expires, key) pairs in a min-heap, sleeps until the earliest one is due and hands due keys to a callback.
+
+    Rescheduling or cancelling a key leaves its old heap entry behind; it is skipped when popped.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.expires = {}
+        self.callback = None
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self.expires)
+
+    def load(self, items):
+        """Replace the schedule with (key, expires) pairs."""
+        self.expires = {key: expires for key, expires in items if expires}
+        self.heap = [(expires, key) for key, expires in self.expires.items()]
+        heapq.heapify(self.heap)
+        self._wakeup.set()
+
+    def schedule(self, key: str, expires: int):
+        self.expires[key] = expires
+        heapq.heappush(self.heap, (expires, key))
+
+        if len(self.heap) > 2 * len(self.expires) + 64:
+            self.load(list(self.expires.items()))
+        elif self.heap[0] == (expires, key):
+            self._wakeup.set()
+
+    def cancel(self, key: str):
+        self.expires.pop(key, None)
+
+    def pop_due(self, now: float) -> list:
+        due = []
+        while self.heap and self.heap[0][0] < now:
+            expires, key = heapq.heappop(self.heap)
+            if self.expires.get(key) == expires:
+                del self.expires[key]
+                due.append(key)
+        return due
+
+    def next_expiry(self):
+        while self.heap and self.expires.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def start(self, callback):
+        self.callback = callback
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            due = self.pop_due(time.time())
+            if due:
+                try:
+                    await self.callback(due)
+                except Exception as error:
+                    traceback.print_exception(type(error), error, error.__traceback__)
+                continue
+
+            next_expiry = self.next_expiry()
+            if next_expiry is None:
+                delay = MAX_SLEEP
+            else:
+                delay = min(max(next_expiry - time.time() + 1, 0), MAX_SLEEP)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+class ExpiringResponses:
+    """Deletes interaction responses after a delay, all driven by one ExpiryScheduler task.
+
+    Replaces an `asyncio.sleep` per command, so the number of tasks stays at one however many responses wait.
+    """
+
+    def __init__(self):
+        self.scheduler = ExpiryScheduler()
+        self.responses = {}
+        self._keys = itertools.count()
+
+    def __len__(self):
+        return len(self.responses)
+
+    def add(self, interaction, delay: float):
+        key = next(self._keys)
+        self.responses[key] = interaction
+        self.scheduler.schedule(key, time.time() + delay)
+        self.scheduler.start(self._expire)
+
+    async def _expire(self, keys: list):
+        interactions = [self.responses.pop(key) for key in keys if key in self.responses]
+        # Already deleted or dismissed responses just raise, nothing to do for them.
+        await asyncio.gather(
+            *(interaction.delete_original_response() for interaction in interactions),
+            return_exceptions=True,
+        )
+
+    async def close(self):
+        """Stop the timer and delete whatever is still waiting, so nothing is left behind on unload."""
+        self.scheduler.stop()
+        await self._expire(list(self.responses))
@@ -0,0 +1,76 @@
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+class HttpClient:
+    """One keep-alive aiohttp session shared by the whole bot. Started in setup_hook and closed on shutdown."""
+
+    def __init__(self, limit: int = 50, limit_per_host: int = 8, timeout: float = 15.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session = None
+        self.metrics = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host
+                ),
+            )
+        return self._session
+
+    async def start(self):
+        self.session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        host = urlsplit(url).netloc
+        metrics = self.metrics.setdefault(
+            host, {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        started = time.perf_counter()
+        try:
+            async with self.session.request(method, url, **kwargs) as resp:
+                self._record(metrics, started)
+                yield resp
+        except (aiohttp.ClientError, TimeoutError):
+            metrics["errors"] += 1
+            raise
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def _record(self, metrics: dict, started: float):
+        elapsed = (time.perf_counter() - started) * 1000
+        metrics["requests"] += 1
+        metrics["total_ms"] += elapsed
+        metrics["max_ms"] = max(metrics["max_ms"], elapsed)
+
+    def stats(self) -> dict:
+        return {
+            host: {
+                "requests": m["requests"],
+                "errors": m["errors"],
+                "avg_ms": round(m["total_ms"] / m["requests"], 1) if m["requests"] else 0.0,
+                "max_ms": round(m["max_ms"], 1),
+            }
+            for host, m in self.metrics.items()
+        }
+
+
+http_client = HttpClient()
@@ -0,0 +1,177 @@
+import asyncio
+import base64
+import os
+import time
+import traceback
+from typing import Optional
+
+import aiohttp
+
+from modules.http_client import http_client
+
+# Point this at tests/unit/modules/fake_mailjet.py to run the bot without sending real email.
+MAILJET_URL = os.getenv("MAILJET_URL") or "https://api.mailjet.com/v3.1/send"
+
+
+# Mailjet accepts at most 50 messages per send call.
+MAX_BATCH_SIZE = 50
+
+
+class EmailDispatcher:
+    """Sends Mailjet v3.1 messages from a bounded queue using a small pool of workers on the shared HTTP client.
+
+    Each worker waits up to `batch_window` seconds (or until `batch_size` messages are queued) and sends everything
+    it collected in one request, so a burst of verifications costs a handful of API calls instead of one each.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        url: str = MAILJET_URL,
+        workers: int = 4,
+        queue_size: int = 200,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        batch_window: float = 0.25,
+        batch_size: int = MAX_BATCH_SIZE,
+    ):
+        credentials = base64.b64encode(f"{api_key}:{api_secret}".encode()).decode()
+        self.headers = {"Authorization": f"Basic {credentials}"}
+        self.url = url
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.batch_window = batch_window
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+
+        self.queue = None
+        self._tasks = []
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.requests = 0
+        self.total_latency = 0.0
+        self.total_delivery_time = 0.0
+
+    async def start(self):
+        if self.queue is not None:
+            return
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self.queue is not None:
+            while not self.queue.empty():
+                _, future, _ = self.queue.get_nowait()
+                if not future.done():
+                    future.set_result(False)
+            self.queue = None
+
+    async def send(self, message: dict) -> bool:
+        """Queue one Mailjet message and wait for it to be delivered. Raises asyncio.QueueFull when the queue is full."""
+        if self.queue is None:
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((message, future, time.perf_counter()))
+        return await future
+
+    async def _next_batch(self, batch: list):
+        batch.append(await self.queue.get())
+        if self.queue.qsize() < self.batch_size - 1:
+            await asyncio.sleep(self.batch_window)
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+
+    async def _worker(self):
+        while True:
+            batch = []
+            try:
+                await self._next_batch(batch)
+                result = await self._post({"Messages": [item[0] for item in batch]})
+                results = (result or {}).get("Messages", [])
+            except asyncio.CancelledError:
+                # Closing mid-batch: these messages were already taken off the queue, so close() can't see them.
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_result(False)
+                raise
+            except Exception as error:
+                traceback.print_exception(type(error), error, error.__traceback__)
+                results = []
+
+            now = time.perf_counter()
+            # Mailjet returns one result per message, in the order they were sent.
+            for i, (_, future, queued_at) in enumerate(batch):
+                delivered = i < len(results) and results[i].get("Status") == "success"
+                if delivered:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+                self.total_delivery_time += now - queued_at
+                if not future.done():
+                    future.set_result(delivered)
+                self.queue.task_done()
+
+    async def _post(self, payload: dict) -> Optional[dict]:
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                async with http_client.post(
+                    self.url,
+                    json=payload,
+                    headers=self.headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ) as resp:
+                    if resp.status == 200:
+                        return await resp.json()
+                    # A 400 still carries per-message results when only some messages were rejected.
+                    if resp.status == 400:
+                        try:
+                            return await resp.json(content_type=None)
+                        except ValueError:
+                            return None
+                    # Only rate limits and server errors are worth retrying.
+                    if resp.status != 429 and resp.status < 500:
+                        return None
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            finally:
+                self.requests += 1
+                self.total_latency += time.perf_counter() - started
+
+            if attempt < self.retries:
+                self.retried += 1
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "requests": self.requests,
+            "messages_per_request": round((self.sent + self.failed) / self.requests, 1)
+            if self.requests
+            else 0.0,
+            "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1)
+            if self.requests
+            else 0.0,
+            "avg_delivery_ms": round(
+                self.total_delivery_time / (self.sent + self.failed) * 1000, 1
+            )
+            if self.sent + self.failed
+            else 0.0,
+        }
@@ -0,0 +1,81 @@
+import time
+from typing import Dict, Optional, Tuple
+
+
+def parse_limit(value: str) -> Tuple[int, float]:
+    """"3/600" -> 3 requests per 600 seconds."""
+    count, _, seconds = value.partition("/")
+    return int(count), float(seconds)
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """Token buckets per key for several named scopes, e.g. one bucket per user and one per email.
+
+    A request passes only if every scope it names has a token left, and only then is a token taken from each,
+    so a rejected request never uses up another scope's allowance. Buckets that have refilled are dropped.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[int, float]], clock=time.monotonic):
+        self.limits = limits
+        self.clock = clock
+        self.buckets = {scope: {} for scope in limits}
+        self.allowed = 0
+        self.rejected = {scope: 0 for scope in limits}
+        self._last_prune = clock()
+
+    def _level(self, scope: str, key, now: float) -> float:
+        capacity, per = self.limits[scope]
+        bucket = self.buckets[scope].get(key)
+        if bucket is None:
+            return capacity
+        return min(capacity, bucket.tokens + (now - bucket.updated) * capacity / per)
+
+    def acquire(self, **keys) -> Optional[float]:
+        """Take a token for each scope=key given. Returns None if allowed, otherwise seconds until it would be."""
+        now = self.clock()
+        self._prune(now)
+
+        levels = {}
+        for scope, key in keys.items():
+            level = self._level(scope, key, now)
+            if level < 1:
+                self.rejected[scope] += 1
+                capacity, per = self.limits[scope]
+                return (1 - level) * per / capacity
+            levels[scope] = level
+
+        for scope, key in keys.items():
+            self.buckets[scope][key] = TokenBucket(levels[scope] - 1, now)
+        self.allowed += 1
+        return None
+
+    def _prune(self, now: float):
+        if now - self._last_prune >= 60:
+            self.evict_idle(now)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Forget buckets that are full again; they behave the same as a new one."""
+        now = self.clock() if now is None else now
+        self._last_prune = now
+        evicted = 0
+        for scope, buckets in self.buckets.items():
+            full = [key for key in buckets if self._level(scope, key, now) >= self.limits[scope][0]]
+            for key in full:
+                del buckets[key]
+            evicted += len(full)
+        return evicted
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+            "tracked": {scope: len(buckets) for scope, buckets in self.buckets.items()},
+        }
@@ -0,0 +1,59 @@
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List
+
+
+def trigrams(text: str) -> set:
+    text = f" {text.lower()} "
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Autocomplete over short keys (module codes) and their descriptions.
+
+    Keys and description words are kept sorted for prefix lookups with bisect. Longer queries also go through
+    a trigram index, so "algorthms" still finds "Algorithms". Built once, then read-only.
+    """
+
+    def __init__(self, documents: Dict[str, str]):
+        self.keys = sorted(documents)
+        self.words = sorted(
+            (word, key)
+            for key, text in documents.items()
+            for word in set(text.lower().split())
+        )
+        self.lowered = sorted((key.lower(), key) for key in documents)
+        self.grams = {}
+        for key, text in documents.items():
+            for gram in trigrams(f"{key} {text}"):
+                self.grams.setdefault(gram, set()).add(key)
+
+    def _prefixed(self, pairs: List[tuple], prefix: str) -> List[str]:
+        found = []
+        i = bisect_left(pairs, (prefix,))
+        while i < len(pairs) and pairs[i][0].startswith(prefix):
+            found.append(pairs[i][1])
+            i += 1
+        return found
+
+    def search(self, query: str, limit: int = 25) -> List[str]:
+        query = query.strip().lower()
+        if not query:
+            return self.keys[:limit]
+
+        results = dict.fromkeys(self._prefixed(self.lowered, query))
+        results.update(dict.fromkeys(self._prefixed(self.words, query)))
+
+        if len(query) >= 3 and len(results) < limit:
+            query_grams = trigrams(query)
+            scores = Counter()
+            for gram in query_grams:
+                scores.update(self.grams.get(gram, ()))
+            # At least half of the query's trigrams must match, best matches first.
+            needed = len(query_grams) / 2
+            for key, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+                if score < needed:
+                    break
+                results.setdefault(key)
+
+        return list(results)[:limit]
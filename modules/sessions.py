@@ -0,0 +1,161 @@
+import secrets
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Optional, Tuple
+
+from modules.store import hash_code
+
+
+class CodeCheck(Enum):
+    OK = "ok"
+    WRONG = "wrong"
+    EXPIRED = "expired"
+    LOCKED = "locked"
+
+
+class VerificationSession:
+    __slots__ = ("user_id", "email", "domain", "code_hash", "salt", "send_welcome", "expires", "attempts")
+
+    def __init__(self, user_id, email, domain, code_hash, salt, send_welcome, expires, attempts=0):
+        self.user_id = user_id
+        self.email = email
+        self.domain = domain
+        self.code_hash = code_hash
+        self.salt = salt
+        self.send_welcome = send_welcome
+        self.expires = expires
+        self.attempts = attempts
+
+    def matches(self, code: int) -> bool:
+        return secrets.compare_digest(hash_code(code, self.salt), self.code_hash)
+
+    def to_json(self) -> dict:
+        return {
+            "email": self.email,
+            "domain": self.domain,
+            "code_hash": self.code_hash,
+            "salt": self.salt,
+            "send_welcome": self.send_welcome,
+            "expires": self.expires,
+            "attempts": self.attempts,
+        }
+
+
+class SessionManager:
+    """Pending email verifications keyed by user ID.
+
+    Sessions expire after `ttl` seconds, a new attempt replaces the user's old one, and at most `max_sessions`
+    are held at once (oldest dropped first), so memory stays bounded however many attempts are abandoned.
+    With a `store`, every change is mirrored there so pending codes survive a restart.
+    """
+
+    def __init__(
+        self, ttl: int = 900, max_attempts: int = 5, max_sessions: int = 10000, store=None
+    ):
+        self.ttl = ttl
+        self.store = store
+        self.max_attempts = max_attempts
+        self.max_sessions = max_sessions
+        # Insertion order is expiry order because every session gets the same TTL.
+        self.sessions = OrderedDict()
+
+        self.started = 0
+        self.replaced = 0
+        self.evicted = 0
+        self.completed = 0
+        self.locked = 0
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def load(self):
+        """Restore unexpired sessions from the store."""
+        if self.store is None:
+            return
+        now = time.time()
+        entries = sorted(self.store.items(), key=lambda item: item[1]["expires"])
+        self.sessions = OrderedDict(
+            (int(user_id), VerificationSession(int(user_id), **entry))
+            for user_id, entry in entries
+            if entry["expires"] > now
+        )
+        self.store.bulk_pop([d for d, e in entries if e["expires"] <= now])
+
+    def start(
+        self, user_id: int, email: str, domain: str, code: int, send_welcome: bool
+    ) -> VerificationSession:
+        self.evict_expired()
+        if self.sessions.pop(user_id, None) is not None:
+            self.replaced += 1
+
+        salt = secrets.token_hex(8)
+        session = VerificationSession(
+            user_id, email, domain, hash_code(code, salt), salt, send_welcome,
+            int(time.time()) + self.ttl,
+        )
+        self.sessions[user_id] = session
+        self.started += 1
+        self._save(session)
+
+        while len(self.sessions) > self.max_sessions:
+            self._forget(self.sessions.popitem(last=False)[0])
+            self.evicted += 1
+        return session
+
+    def get(self, user_id: int) -> Optional[VerificationSession]:
+        self.evict_expired()
+        return self.sessions.get(user_id)
+
+    def check(self, user_id: int, code: str) -> Tuple[CodeCheck, Optional[VerificationSession]]:
+        session = self.get(user_id)
+        if session is None:
+            return CodeCheck.EXPIRED, None
+
+        if code.strip().isdigit() and session.matches(int(code)):
+            self.end(user_id)
+            self.completed += 1
+            return CodeCheck.OK, session
+
+        session.attempts += 1
+        if session.attempts >= self.max_attempts:
+            self.end(user_id)
+            self.locked += 1
+            return CodeCheck.LOCKED, session
+        self._save(session)
+        return CodeCheck.WRONG, session
+
+    def end(self, user_id: int):
+        if self.sessions.pop(user_id, None) is not None:
+            self._forget(user_id)
+
+    def _save(self, session: VerificationSession):
+        if self.store is not None:
+            self.store.set(str(session.user_id), session.to_json())
+
+    def _forget(self, user_id: int):
+        if self.store is not None:
+            self.store.pop(str(user_id))
+
+    def evict_expired(self) -> int:
+        now = time.time()
+        evicted = 0
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.expires > now:
+                break
+            self._forget(self.sessions.popitem(last=False)[0])
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def stats(self) -> dict:
+        self.evict_expired()
+        return {
+            "live": len(self.sessions),
+            "started": self.started,
+            "replaced": self.replaced,
+            "evicted": self.evicted,
+            "completed": self.completed,
+            "locked": self.locked,
+        }
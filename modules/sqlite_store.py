@@ -0,0 +1,283 @@
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verify (
+    discord_id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    email_lower TEXT NOT NULL,
+    expires INTEGER
+);
+CREATE INDEX IF NOT EXISTS verify_email_lower ON verify (email_lower);
+CREATE INDEX IF NOT EXISTS verify_expires ON verify (expires);
+
+CREATE TABLE IF NOT EXISTS minecraft (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    discord_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    username_lower TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS minecraft_discord_id ON minecraft (discord_id);
+"""
+
+
+class SqliteDatabase:
+    """One SQLite connection in WAL mode, used from a single worker thread so queries never block the event loop."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+
+    def connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def call(self, fn, *args):
+        """Run fn(conn, *args) inside one transaction on the current thread."""
+        conn = self.connect()
+        with conn:
+            return fn(conn, *args)
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.call, fn, *args)
+
+    def flush(self):
+        if self._conn is not None:
+            self._executor.submit(
+                self._conn.execute, "PRAGMA wal_checkpoint(TRUNCATE)"
+            ).result()
+
+
+class SqliteVerifyStore:
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    def load(self):
+        self.database.connect()
+
+    def flush(self):
+        self.database.flush()
+
+    async def has(self, discord_id: str) -> bool:
+        return await self.get(discord_id) is not None
+
+    async def get(self, discord_id: str) -> Optional[dict]:
+        def query(conn):
+            return conn.execute(
+                "SELECT email, expires FROM verify WHERE discord_id = ?",
+                (discord_id,),
+            ).fetchone()
+
+        row = await self.database.run(query)
+        if row is None:
+            return None
+        return {"email": row[0], "expires": row[1]}
+
+    async def items(self) -> List[Tuple[str, dict]]:
+        def query(conn):
+            return conn.execute(
+                "SELECT discord_id, email, expires FROM verify"
+            ).fetchall()
+
+        rows = await self.database.run(query)
+        return [(row[0], {"email": row[1], "expires": row[2]}) for row in rows]
+
+    async def set(self, discord_id: str, email: str, expires: int):
+        await self.database.run(upsert_verify, discord_id, email, expires)
+
+    async def bulk_set(self, rows: List[Tuple[str, str, int]]):
+        def query(conn):
+            for row in rows:
+                upsert_verify(conn, *row)
+
+        await self.database.run(query)
+
+    async def pop(self, discord_id: str) -> Optional[dict]:
+        def query(conn):
+            row = conn.execute(
+                "SELECT email, expires FROM verify WHERE discord_id = ?",
+                (discord_id,),
+            ).fetchone()
+            conn.execute("DELETE FROM verify WHERE discord_id = ?", (discord_id,))
+            return row
+
+        row = await self.database.run(query)
+        if row is None:
+            return None
+        return {"email": row[0], "expires": row[1]}
+
+    async def find_by_email(self, email: str) -> Optional[str]:
+        def query(conn):
+            return conn.execute(
+                "SELECT discord_id FROM verify WHERE email_lower = ?",
+                (email.strip().lower(),),
+            ).fetchone()
+
+        row = await self.database.run(query)
+        return row[0] if row else None
+
+
+class SqliteMinecraftStore:
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    def load(self):
+        self.database.connect()
+
+    def flush(self):
+        self.database.flush()
+
+    async def has(self, discord_id: str) -> bool:
+        def query(conn):
+            return conn.execute(
+                "SELECT 1 FROM minecraft WHERE discord_id = ? LIMIT 1", (discord_id,)
+            ).fetchone()
+
+        return await self.database.run(query) is not None
+
+    async def get(self, discord_id: str) -> List[str]:
+        return await self.database.run(select_usernames, discord_id)
+
+    async def items(self) -> List[Tuple[str, List[str]]]:
+        def query(conn):
+            return conn.execute(
+                "SELECT discord_id, username FROM minecraft ORDER BY id"
+            ).fetchall()
+
+        grouped = {}
+        for discord_id, username in await self.database.run(query):
+            grouped.setdefault(discord_id, []).append(username)
+        return list(grouped.items())
+
+    async def add(self, discord_id: str, username: str):
+        await self.database.run(insert_username, discord_id, username)
+
+    async def bulk_add(self, rows: List[Tuple[str, str]]):
+        def query(conn):
+            for row in rows:
+                insert_username(conn, *row)
+
+        await self.database.run(query)
+
+    async def pop(self, discord_id: str) -> List[str]:
+        def query(conn):
+            usernames = select_usernames(conn, discord_id)
+            conn.execute("DELETE FROM minecraft WHERE discord_id = ?", (discord_id,))
+            return usernames
+
+        return await self.database.run(query)
+
+    async def find_by_username(self, username: str) -> Optional[str]:
+        def query(conn):
+            return conn.execute(
+                "SELECT discord_id FROM minecraft WHERE username_lower = ?",
+                (username.strip().lower(),),
+            ).fetchone()
+
+        row = await self.database.run(query)
+        return row[0] if row else None
+
+
+def upsert_verify(conn, discord_id: str, email: str, expires: Optional[int]):
+    conn.execute(
+        "INSERT INTO verify (discord_id, email, email_lower, expires) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (discord_id) DO UPDATE SET email = excluded.email, "
+        "email_lower = excluded.email_lower, expires = excluded.expires",
+        (discord_id, email, email.strip().lower(), expires),
+    )
+
+
+def insert_username(conn, discord_id: str, username: str):
+    conn.execute(
+        "INSERT INTO minecraft (discord_id, username, username_lower) VALUES (?, ?, ?)",
+        (discord_id, username, username.strip().lower()),
+    )
+
+
+def select_usernames(conn, discord_id: str) -> List[str]:
+    rows = conn.execute(
+        "SELECT username FROM minecraft WHERE discord_id = ? ORDER BY id",
+        (discord_id,),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+class DatabaseNotEmpty(Exception):
+    pass
+
+
+def migrate_json_to_sqlite(
+    verify_path: str, mc_path: str, database: SqliteDatabase, force: bool = False
+):
+    """One-shot import of verify.json and minecraft.json into an empty database.
+
+    Once the bot runs on SQLite the JSON files go stale, so importing them again would bring back unverified
+    users and drop newer whitelists. Refuses with DatabaseNotEmpty unless `force` is set, which replaces both
+    tables with the files.
+    """
+    verify_data, mc_data = {}, {}
+    if os.path.exists(verify_path):
+        with open(verify_path, "r", encoding="utf-8") as f:
+            verify_data = json.load(f)
+    if os.path.exists(mc_path):
+        with open(mc_path, "r", encoding="utf-8") as f:
+            mc_data = json.load(f)
+
+    def migrate(conn):
+        if force:
+            conn.execute("DELETE FROM verify")
+            conn.execute("DELETE FROM minecraft")
+        elif conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM verify) OR EXISTS (SELECT 1 FROM minecraft)"
+        ).fetchone()[0]:
+            raise DatabaseNotEmpty(
+                f"{database.path} already has data, use --force to replace it"
+            )
+
+        for discord_id, entry in verify_data.items():
+            upsert_verify(conn, discord_id, entry.get("email", ""), entry.get("expires"))
+
+        skipped = 0
+        for discord_id, usernames in mc_data.items():
+            for username in usernames:
+                try:
+                    insert_username(conn, discord_id, username)
+                except sqlite3.IntegrityError:
+                    skipped += 1
+        return skipped
+
+    skipped = database.call(migrate)
+    return len(verify_data), sum(len(u) for u in mc_data.values()), skipped
+
+
+if __name__ == "__main__":
+    # python -m modules.sqlite_store [--force] [database path]
+    from modules import enums
+
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    path = args[0] if args else enums.FileLocations.Database.value
+    try:
+        verified, usernames, skipped = migrate_json_to_sqlite(
+            enums.FileLocations.Verify.value,
+            enums.FileLocations.MCData.value,
+            SqliteDatabase(path),
+            force="--force" in sys.argv[1:],
+        )
+    except DatabaseNotEmpty as error:
+        sys.exit(str(error))
+    print(
+        f"Migrated {verified} verify entries and {usernames - skipped} Minecraft usernames to {path}"
+        + (f" ({skipped} duplicate usernames skipped)." if skipped else ".")
+    )
@@ -0,0 +1,402 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import threading
+from typing import List, Optional, Tuple
+
+from modules import enums
+from modules.utils import atomic_write_text, ensure_json_exists
+
+# Seconds to wait after a change before writing, so bursts share one write.
+FLUSH_DELAY = 2.0
+
+stores = []
+
+
+class JsonStore:
+    """A JSON file loaded once and kept in memory. Changes are written back in the background."""
+
+    def __init__(self, path: str, empty_structure=None):
+        self.path = path
+        self.empty_structure = {} if empty_structure is None else empty_structure
+        self._data = None
+        self._version = 0
+        self._written_version = 0
+        self._flush_handle = None
+        self._write_lock = threading.Lock()
+        stores.append(self)
+
+    @property
+    def data(self):
+        if self._data is None:
+            self.load()
+        return self._data
+
+    def load(self):
+        ensure_json_exists(self.path, self.empty_structure)
+        with open(self.path, "r", encoding="utf-8") as f:
+            self._data = self.decode(json.load(f))
+        self._version = self._written_version = 0
+        self.build_indexes()
+
+    def decode(self, raw):
+        return raw
+
+    def build_indexes(self):
+        pass
+
+    def encode(self):
+        return self._data
+
+    def mark_dirty(self):
+        self._version += 1
+        if self._flush_handle is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+
+        self._flush_handle = loop.call_later(FLUSH_DELAY, self._flush_in_background)
+
+    def _flush_in_background(self):
+        self._flush_handle = None
+        if self._version == self._written_version:
+            return
+        text = json.dumps(self.encode(), indent=4)
+        asyncio.get_running_loop().run_in_executor(
+            None, self._write, text, self._version
+        )
+
+    def _write(self, text: str, version: int):
+        with self._write_lock:
+            # An older snapshot finishing late must not overwrite a newer one.
+            if version <= self._written_version:
+                return
+            atomic_write_text(self.path, text)
+            self._written_version = version
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._data is None or self._version == self._written_version:
+            return
+        self._write(json.dumps(self.encode(), indent=4), self._version)
+
+
+class VerifyStore(JsonStore):
+    """verify.json: discord_id -> {"email": ..., "expires": ...}, with a lower-cased email -> discord_id index."""
+
+    def build_indexes(self):
+        self._by_email = {
+            entry.get("email", "").lower(): discord_id
+            for discord_id, entry in self._data.items()
+        }
+
+    def _unindex(self, discord_id: str, entry: Optional[dict]):
+        if entry is None:
+            return
+        email = entry.get("email", "").lower()
+        if self._by_email.get(email) == discord_id:
+            del self._by_email[email]
+
+    async def has(self, discord_id: str) -> bool:
+        return discord_id in self.data
+
+    async def get(self, discord_id: str) -> Optional[dict]:
+        return self.data.get(discord_id)
+
+    async def items(self) -> List[Tuple[str, dict]]:
+        return list(self.data.items())
+
+    async def set(self, discord_id: str, email: str, expires: int):
+        self._unindex(discord_id, self.data.get(discord_id))
+        self.data[discord_id] = {"email": email, "expires": expires}
+        self._by_email[email.lower()] = discord_id
+        self.mark_dirty()
+
+    async def bulk_set(self, rows: List[Tuple[str, str, int]]):
+        """Apply many (discord_id, email, expires) rows and write them out together."""
+        for discord_id, email, expires in rows:
+            self._unindex(discord_id, self.data.get(discord_id))
+            self.data[discord_id] = {"email": email, "expires": expires}
+            self._by_email[email.lower()] = discord_id
+        self.mark_dirty()
+
+    async def pop(self, discord_id: str) -> Optional[dict]:
+        entry = self.data.pop(discord_id, None)
+        if entry is not None:
+            self._unindex(discord_id, entry)
+            self.mark_dirty()
+        return entry
+
+    async def find_by_email(self, email: str) -> Optional[str]:
+        if self._data is None:
+            self.load()
+        return self._by_email.get(email.strip().lower())
+
+
+class MinecraftStore(JsonStore):
+    """minecraft.json: discord_id -> [minecraft usernames], with a lower-cased username -> discord_id index."""
+
+    def build_indexes(self):
+        self._by_username = {
+            username.lower(): discord_id
+            for discord_id, usernames in self._data.items()
+            for username in usernames
+        }
+
+    async def has(self, discord_id: str) -> bool:
+        return discord_id in self.data
+
+    async def get(self, discord_id: str) -> List[str]:
+        return list(self.data.get(discord_id, []))
+
+    async def items(self) -> List[Tuple[str, List[str]]]:
+        return [(d, list(usernames)) for d, usernames in self.data.items()]
+
+    async def add(self, discord_id: str, username: str):
+        self.data.setdefault(discord_id, []).append(username)
+        self._by_username[username.lower()] = discord_id
+        self.mark_dirty()
+
+    async def bulk_add(self, rows: List[Tuple[str, str]]):
+        for discord_id, username in rows:
+            self.data.setdefault(discord_id, []).append(username)
+            self._by_username[username.lower()] = discord_id
+        self.mark_dirty()
+
+    async def pop(self, discord_id: str) -> List[str]:
+        usernames = self.data.pop(discord_id, None)
+        if usernames is None:
+            return []
+        for username in usernames:
+            if self._by_username.get(username.lower()) == discord_id:
+                del self._by_username[username.lower()]
+        self.mark_dirty()
+        return usernames
+
+    async def find_by_username(self, username: str) -> Optional[str]:
+        if self._data is None:
+            self.load()
+        return self._by_username.get(username.strip().lower())
+
+
+def hash_email(email: str, salt: str) -> str:
+    digest = hmac.new(salt.encode(), email.encode(), hashlib.sha256).hexdigest()
+    return f"sha256:{digest}"
+
+
+class BannedStore(JsonStore):
+    """banned.json: banned emails and patterns, indexed in memory so a check never scans the list.
+
+    Entries can be a single address ("ab123@dmu.ac.uk"), a whole domain ("*@example.com"), every subdomain of a
+    domain ("*@*.example.com") or a local-part prefix ("spam*@student.le.ac.uk"). When a salt is set, single
+    addresses are stored as salted hashes so the raw emails never stay on disk.
+    """
+
+    def __init__(self, path: str, salt: Optional[str] = None):
+        super().__init__(path, [])
+        self.salt = salt
+
+    def load(self):
+        super().load()
+        if self.salt and any("*" not in e and "@" in e for e in self._data):
+            self._data = {self.entry_key(e) for e in self._data}
+            self.build_indexes()
+            self.mark_dirty()
+
+    def decode(self, raw) -> set:
+        return {normalise_ban(entry) for entry in raw}
+
+    def encode(self):
+        return sorted(self._data)
+
+    def entries(self) -> List[str]:
+        return sorted(self.data)
+
+    def build_indexes(self):
+        self._exact = set()
+        self._domains = set()
+        self._subdomains = set()
+        self._prefixes = set()
+        for entry in self._data:
+            self._index(entry)
+
+    def _index(self, entry: str):
+        local, _, domain = entry.rpartition("@")
+        if local == "*" and domain.startswith("*."):
+            self._subdomains.add(domain[2:])
+        elif local == "*":
+            self._domains.add(domain)
+        elif local.endswith("*"):
+            self._prefixes.add((local[:-1], domain))
+        else:
+            self._exact.add(entry)
+
+    def entry_key(self, entry: str) -> str:
+        if self.salt and "*" not in entry and "@" in entry:
+            return hash_email(entry, self.salt)
+        return entry
+
+    def __contains__(self, email: str):
+        if self._data is None:
+            self.load()
+
+        email = email.strip().lower()
+        if self.entry_key(email) in self._exact:
+            return True
+
+        local, _, domain = email.rpartition("@")
+        if domain in self._domains:
+            return True
+
+        labels = domain.split(".")
+        for i in range(1, len(labels)):
+            if ".".join(labels[i:]) in self._subdomains:
+                return True
+
+        if self._prefixes:
+            for i in range(len(local) + 1):
+                if (local[:i], domain) in self._prefixes:
+                    return True
+
+        return False
+
+    def add(self, entry: str) -> bool:
+        if not self._add(entry):
+            return False
+        self.mark_dirty()
+        return True
+
+    def bulk_add(self, entries: List[str]) -> int:
+        added = sum(self._add(entry) for entry in entries)
+        if added:
+            self.mark_dirty()
+        return added
+
+    def _add(self, entry: str) -> bool:
+        entry = normalise_ban(entry)
+        if "*" not in entry and entry in self:
+            return False
+
+        key = self.entry_key(entry)
+        if key in self.data:
+            return False
+        self.data.add(key)
+        self._index(key)
+        return True
+
+
+def load_code_secret(path: str) -> bytes:
+    """Key for pending code hashes: PENDING_CODE_SECRET, or a random one generated once and kept in its own file."""
+    secret = os.getenv("PENDING_CODE_SECRET")
+    if secret:
+        return secret.encode()
+
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    key = secrets.token_hex(32).encode()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+_code_secret = None
+
+
+def hash_code(code: int, salt: str) -> str:
+    # Keyed, so the 100,000 possible codes can't be tried against pending.json without the secret.
+    global _code_secret
+    if _code_secret is None:
+        _code_secret = load_code_secret(enums.FileLocations.PendingSecret.value)
+    digest = hmac.new(_code_secret, f"{salt}:{code}".encode(), hashlib.sha256).hexdigest()
+    return f"hmac-sha256:{digest}"
+
+
+class PendingStore(JsonStore):
+    """pending.json: discord_id -> an unfinished verification, so codes survive restarts and reloads.
+
+    Only an HMAC of each code is kept, keyed with a secret that is never written to this file. Entries are
+    short-lived and dropped once they expire.
+    """
+
+    def items(self) -> List[Tuple[str, dict]]:
+        return list(self.data.items())
+
+    def set(self, discord_id: str, entry: dict):
+        self.data[discord_id] = entry
+        self.mark_dirty()
+
+    def pop(self, discord_id: str) -> Optional[dict]:
+        entry = self.data.pop(discord_id, None)
+        if entry is not None:
+            self.mark_dirty()
+        return entry
+
+    def bulk_pop(self, discord_ids: List[str]):
+        removed = [self.data.pop(d, None) for d in discord_ids]
+        if any(entry is not None for entry in removed):
+            self.mark_dirty()
+
+
+EMAIL_PATTERN = re.compile(r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,7}$")
+BAN_PATTERN = re.compile(r"^(\*|[a-z0-9._%+-]+\*?)@(\*\.)?[a-z0-9.-]+\.[a-z]{2,7}$")
+
+
+def normalise_ban(entry: str) -> str:
+    entry = entry.strip().lower()
+    if entry.startswith("@"):
+        entry = "*" + entry
+    return entry
+
+
+def valid_ban(entry: str) -> bool:
+    """Whether a normalised entry is an email or one of the patterns BannedStore understands."""
+    return bool(EMAIL_PATTERN.match(entry) or BAN_PATTERN.match(entry))
+
+
+def flush_all():
+    for store in stores:
+        store.flush()
+
+
+# "json" (default) or "sqlite". Both expose the same async API to the cogs.
+storage_backend = os.getenv("STORAGE_BACKEND", "json").strip().lower()
+
+if storage_backend == "sqlite":
+    from modules.sqlite_store import (
+        SqliteDatabase,
+        SqliteMinecraftStore,
+        SqliteVerifyStore,
+    )
+
+    database = SqliteDatabase(
+        os.getenv("SQLITE_PATH") or enums.FileLocations.Database.value
+    )
+    stores.append(database)
+    verify_store = SqliteVerifyStore(database)
+    mc_store = SqliteMinecraftStore(database)
+else:
+    verify_store = VerifyStore(enums.FileLocations.Verify.value)
+    mc_store = MinecraftStore(enums.FileLocations.MCData.value)
+
+pending_store = PendingStore(enums.FileLocations.Pending.value)
+# Bookkeeping for Trello-backed messages, e.g. which message holds the rules and a hash of its content.
+sync_state = JsonStore(enums.FileLocations.TrelloSync.value)
+banned_store = BannedStore(
+    enums.FileLocations.Banned.value, os.getenv("BANNED_EMAIL_SALT") or None
+)
+
@@ -0,0 +1,39 @@
+import hashlib
+import json
+import os
+from typing import List
+
+from modules.http_client import http_client
+
+TRELLO_API = "https://api.trello.com/1"
+CARD_FIELDS = "id,name,desc,pos,dateLastActivity"
+
+
+class TrelloError(Exception):
+    pass
+
+
+async def fetch_list_cards(list_id: str, **params) -> List[dict]:
+    """Cards of a Trello list, fetched on the shared HTTP session instead of the blocking Trello client."""
+    params = {
+        "key": os.getenv("TRELLO_KEY"),
+        "token": os.getenv("TRELLO_TOKEN"),
+        "fields": CARD_FIELDS,
+        **params,
+    }
+    url = f"{TRELLO_API}/lists/{list_id}/cards"
+    async with http_client.get(url, params=params) as resp:
+        if resp.status != 200:
+            raise TrelloError(f"Trello returned {resp.status} for list {list_id}")
+        return await resp.json()
+
+
+def content_hash(payload) -> str:
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def card_signature(cards: List[dict]) -> str:
+    """Changes whenever a card of the list is added, removed, moved or edited."""
+    return content_hash([(card["id"], card.get("dateLastActivity")) for card in cards])
@@ -1,5 +1,6 @@
 import os
 import json
+import tempfile
 
 
 def ensure_json_exists(file_path: str, empty_strutrure=None):
@@ -8,3 +9,20 @@ def ensure_json_exists(file_path: str, empty_strutrure=None):
             empty_strutrure = {}
         with open(file_path, "w", encoding="utf-8") as f:
             json.dump(empty_strutrure, f)
+
+
+def atomic_write_text(file_path: str, text: str):
+    """Write to a temp file next to the target and swap it in, so a crash mid-write never leaves a truncated file."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
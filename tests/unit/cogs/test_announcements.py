@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cogs import announcements
+from modules.store import JsonStore
+
+
+def card(card_id: str, name: str, minute: int = 0) -> dict:
+    return {
+        "id": card_id,
+        "name": name,
+        "desc": "...",
+        "dateLastActivity": f"2024-01-01T12:{minute:02d}:00.000Z",
+    }
+
+
+@pytest.fixture
+def cog(tmp_path):
+    state = JsonStore(str(tmp_path / "trello_sync.json"))
+    bot = MagicMock()
+    channel = MagicMock()
+    channel.send = AsyncMock()
+    bot.get_channel.return_value = channel
+    guild = MagicMock()
+    guild.id = announcements.enums.Guild.LeicesterCS.value
+
+    with patch.object(announcements, "sync_state", state):
+        yield announcements.Announcements(bot), guild, channel, state
+
+
+@pytest.mark.asyncio
+async def test_first_poll_only_records_the_cards(cog):
+    cog, guild, channel, state = cog
+    cards = [card("a", "Old"), card("b", "Older still")]
+
+    with patch.object(announcements, "fetch_list_cards", AsyncMock(return_value=cards)):
+        assert await cog.publish_new(guild) == 0
+
+    channel.send.assert_not_awaited()
+    assert state.data[f"announcements:{guild.id}"]["posted"] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_new_cards_are_posted_once_in_order(cog):
+    cog, guild, channel, state = cog
+    old = [card("a", "Old")]
+    cards = old + [card("c", "Second", minute=30), card("b", "First", minute=10)]
+
+    fetch = AsyncMock(side_effect=[old, cards, cards])
+    with patch.object(announcements, "fetch_list_cards", fetch):
+        await cog.publish_new(guild)
+        assert await cog.publish_new(guild) == 2
+        assert await cog.publish_new(guild) == 0
+
+    titles = [c.kwargs["embed"].title for c in channel.send.await_args_list]
+    assert titles == ["First", "Second"]
+    assert "since" not in fetch.await_args.kwargs
+    assert cog.stats()["published"] == 2
+
+
+@pytest.mark.asyncio
+async def test_card_moved_into_the_list_is_posted(cog):
+    cog, guild, channel, state = cog
+    # An old card ID, as if it was created long ago on another list and moved in.
+    moved = card("0000000100000000", "Moved in")
+
+    fetch = AsyncMock(side_effect=[[card("ffffffff00000000", "Newest")], [moved]])
+    with patch.object(announcements, "fetch_list_cards", fetch):
+        await cog.publish_new(guild)
+        assert await cog.publish_new(guild) == 1
+
+    assert channel.send.await_args.kwargs["embed"].title == "Moved in"
+    # Cards that left the list are forgotten.
+    assert state.data[f"announcements:{guild.id}"]["posted"] == [moved["id"]]
+
+
+@pytest.mark.asyncio
+async def test_missing_channel_is_retried(cog):
+    cog, guild, channel, state = cog
+    fresh = card("b", "Fresh")
+    cog.bot.get_channel.return_value = None
+
+    fetch = AsyncMock(side_effect=[[], [fresh], [fresh]])
+    with patch.object(announcements, "fetch_list_cards", fetch):
+        await cog.publish_new(guild)
+        assert await cog.publish_new(guild) == 0
+        cog.bot.get_channel.return_value = channel
+        assert await cog.publish_new(guild) == 1
+
+    channel.send.assert_awaited_once()
@@ -0,0 +1,209 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+import pytest
+
+from cogs import guild as guild_cog
+from modules.store import JsonStore
+from cogs.guild import ROLE_ASSIGN, RoleAssignView, RoleCache, toggle_role
+
+
+def make_guild(names):
+    roles = {
+        i: SimpleNamespace(id=i, name=name, mention=f"<@&{i}>")
+        for i, name in enumerate(names)
+    }
+    guild = MagicMock()
+    guild.id = 1
+    guild.roles = list(roles.values())
+    guild.get_role.side_effect = roles.get
+    return guild
+
+
+@pytest.mark.asyncio
+async def test_views_keep_their_custom_ids():
+    custom_ids = [
+        [item.custom_id for item in RoleAssignView(group).children][:-1]
+        for group in ROLE_ASSIGN
+    ]
+
+    assert custom_ids == [
+        [
+            "foundation_year",
+            "First_year",
+            "Second_year",
+            "sandwich_year",
+            "Third_year",
+            "postgraduate",
+        ],
+        ["he_him", "she_her", "they_them", "other_pronouns"],
+        ["hackathons", "talks", "socials"],
+    ]
+
+
+def test_role_cache_builds_once_until_invalidated():
+    cache = RoleCache({"talks": "Talks Ping", "socials": "Social Ping"})
+    guild = make_guild(["Talks Ping"])
+
+    assert cache.get(guild, "talks").id == 0
+    assert cache.get(guild, "socials") is None
+
+    guild.roles = [SimpleNamespace(id=5, name="Social Ping")]
+    assert cache.get(guild, "socials") is None
+    cache.invalidate(guild.id)
+    cache.build(guild)
+    assert cache.guilds[1] == {"socials": 5}
+
+
+def make_interaction(guild, held):
+    interaction = MagicMock()
+    interaction.guild = guild
+    everyone = SimpleNamespace(id=99, is_default=lambda: True)
+    member_roles = [everyone] + [
+        SimpleNamespace(id=role.id, is_default=lambda: False)
+        for role in guild.roles
+        if role.id in held
+    ]
+    interaction.user.roles = member_roles
+    interaction.user.get_role.side_effect = lambda i: object() if i in held else None
+    interaction.user.edit = AsyncMock()
+    interaction.response.send_message = AsyncMock()
+    return interaction
+
+
+def edited_role_ids(interaction):
+    return sorted(role.id for role in interaction.user.edit.await_args.kwargs["roles"])
+
+
+@pytest.mark.asyncio
+async def test_exclusive_toggle_swaps_roles_in_one_edit():
+    guild_cog.role_cache.invalidate(1)
+    guild = make_guild(["Year 1", "Year 2", "Talks Ping"])
+    interaction = make_interaction(guild, held={0, 2})
+
+    await toggle_role(interaction, "year", "Second_year")
+
+    interaction.user.edit.assert_awaited_once()
+    assert edited_role_ids(interaction) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_toggle_in_open_group_adds_and_removes():
+    guild_cog.role_cache.invalidate(1)
+    guild = make_guild(["Hackathon Ping", "Talks Ping"])
+
+    interaction = make_interaction(guild, held={0})
+    await toggle_role(interaction, "pings", "talks")
+    assert edited_role_ids(interaction) == [0, 1]
+
+    interaction = make_interaction(guild, held={0, 1})
+    await toggle_role(interaction, "pings", "talks")
+    assert edited_role_ids(interaction) == [0]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_selection_skips_the_edit():
+    guild_cog.role_cache.invalidate(1)
+    guild = make_guild(["Hackathon Ping", "Talks Ping"])
+    interaction = make_interaction(guild, held={1})
+
+    roles = guild_cog.group_roles(guild, "pings")
+    await guild_cog.set_group_roles(interaction, "pings", roles, {"talks"})
+
+    interaction.user.edit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cooldown_is_shared_across_panels():
+    guild_cog.role_cooldown.buckets["user"].clear()
+    interaction = MagicMock()
+    interaction.user.id = 42
+    interaction.response.send_message = AsyncMock()
+
+    checks = [
+        await RoleAssignView(group).interaction_check(interaction)
+        for group in ["year", "pronouns", "pings"] * 3
+    ]
+
+    assert checks == [True] * 6 + [False] * 3
+    assert guild_cog.role_cooldown.stats()["tracked"]["user"] == 1
+
+
+RULES_CARDS = [
+    {"id": "a", "name": "Rules|Be nice", "desc": "https://example.com/banner.png"},
+    {"id": "b", "name": "1. Respect", "desc": "Treat everyone with respect."},
+    {"id": "c", "name": "Questions?", "desc": "Ask the committee."},
+]
+
+
+@pytest.fixture
+def rules_guild(tmp_path):
+    channel = MagicMock()
+    channel.id = 10
+    sent = MagicMock(id=500)
+    channel.send = AsyncMock(return_value=sent)
+    partial = MagicMock(id=500)
+    partial.edit = AsyncMock()
+    channel.get_partial_message.return_value = partial
+
+    async def no_history(**kwargs):
+        return
+        yield
+
+    channel.history = no_history
+    guild = MagicMock()
+    guild.id = guild_cog.enums.Guild.LeicesterCS.value
+    guild.rules_channel = channel
+
+    state = JsonStore(str(tmp_path / "trello_sync.json"))
+    with patch.object(guild_cog, "sync_state", state):
+        yield guild, channel, partial
+
+
+@pytest.mark.asyncio
+async def test_sync_rules_posts_then_skips_unchanged(rules_guild):
+    guild, channel, partial = rules_guild
+    cards = [dict(card, dateLastActivity="1") for card in RULES_CARDS]
+
+    with patch.object(guild_cog, "fetch_list_cards", AsyncMock(return_value=cards)):
+        assert await guild_cog.sync_rules(MagicMock(), guild) == "posted"
+        assert await guild_cog.sync_rules(MagicMock(), guild) == "unchanged"
+        assert await guild_cog.sync_rules(MagicMock(), guild, force=True) == "unchanged"
+
+    channel.send.assert_awaited_once()
+    partial.edit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sync_rules_edits_stored_message_on_change(rules_guild):
+    guild, channel, partial = rules_guild
+    cards = [dict(card, dateLastActivity="1") for card in RULES_CARDS]
+    with patch.object(guild_cog, "fetch_list_cards", AsyncMock(return_value=cards)):
+        await guild_cog.sync_rules(MagicMock(), guild)
+
+    cards[1] = dict(cards[1], desc="Be kind.", dateLastActivity="2")
+    with patch.object(guild_cog, "fetch_list_cards", AsyncMock(return_value=cards)):
+        assert await guild_cog.sync_rules(MagicMock(), guild) == "updated"
+
+    channel.get_partial_message.assert_called_with(500)
+    partial.edit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_sync_rules_retries_a_failed_edit(rules_guild):
+    guild, channel, partial = rules_guild
+    cards = [dict(card, dateLastActivity="1") for card in RULES_CARDS]
+    with patch.object(guild_cog, "fetch_list_cards", AsyncMock(return_value=cards)):
+        await guild_cog.sync_rules(MagicMock(), guild)
+
+    cards[1] = dict(cards[1], desc="Be kind.", dateLastActivity="2")
+    partial.edit.side_effect = discord.HTTPException(MagicMock(status=500), "error")
+    with patch.object(guild_cog, "fetch_list_cards", AsyncMock(return_value=cards)):
+        with pytest.raises(discord.HTTPException):
+            await guild_cog.sync_rules(MagicMock(), guild)
+
+        partial.edit.side_effect = None
+        assert await guild_cog.sync_rules(MagicMock(), guild) == "updated"
+
+    assert partial.edit.await_count == 2
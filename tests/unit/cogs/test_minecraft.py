@@ -0,0 +1,204 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cogs import minecraft
+from cogs.minecraft import WhitelistBatcher
+from modules.store import MinecraftStore
+
+
+@pytest.mark.asyncio
+async def test_batcher_combines_commands_into_one_call():
+    batcher = WhitelistBatcher(window=0.05)
+    with patch(
+        "cogs.minecraft.send_console_command", AsyncMock(return_value=True)
+    ) as send:
+        results = await asyncio.gather(
+            batcher.add("Steve"),
+            batcher.add("Alex"),
+            batcher.remove(["Notch", "Herobrine"]),
+        )
+
+    assert results == [True, True, True]
+    send.assert_awaited_once_with(
+        "whitelist add Steve; whitelist add Alex; whitelist remove Notch; whitelist remove Herobrine"
+    )
+
+
+@pytest.mark.asyncio
+async def test_batcher_cancels_add_then_remove():
+    batcher = WhitelistBatcher(window=0.05)
+    with patch(
+        "cogs.minecraft.send_console_command", AsyncMock(return_value=True)
+    ) as send:
+        results = await asyncio.gather(
+            batcher.add("Steve"), batcher.remove(["steve"]), batcher.add("Alex")
+        )
+
+    assert results == [True, True, True]
+    send.assert_awaited_once_with("whitelist add Alex")
+
+
+@pytest.mark.asyncio
+async def test_batcher_reports_failure_to_every_caller():
+    batcher = WhitelistBatcher(window=0.05)
+    with patch("cogs.minecraft.send_console_command", AsyncMock(return_value=False)):
+        results = await asyncio.gather(batcher.add("Steve"), batcher.remove(["Alex"]))
+
+    assert results == [False, False]
+
+
+@pytest.mark.asyncio
+async def test_whitelist_modal_defers_before_waiting_on_the_batcher(tmp_path):
+    calls = []
+    interaction = MagicMock()
+    interaction.user.id = 1
+    interaction.user.add_roles = AsyncMock()
+    interaction.response.defer = AsyncMock(
+        side_effect=lambda **kwargs: calls.append("defer")
+    )
+    interaction.followup.send = AsyncMock()
+
+    async def add(username):
+        calls.append("batcher")
+        return True
+
+    modal = minecraft.WhitelistModal()
+    modal.username._value = "Steve"
+    modal.confirm._value = "Yes"
+    store = MinecraftStore(str(tmp_path / "minecraft.json"))
+    with patch.object(minecraft, "mc_store", store), patch.object(
+        minecraft.whitelist_batcher, "add", add
+    ):
+        await modal.on_submit(interaction)
+
+    assert calls == ["defer", "batcher"]
+    interaction.followup.send.assert_awaited_once_with(
+        "Successfully whitelisted `Steve`!", ephemeral=True
+    )
+
+
+def make_cog():
+    # Skips __init__, which starts the status poller.
+    cog = minecraft.Minecraft.__new__(minecraft.Minecraft)
+    cog.bot = MagicMock()
+    cog.server = None
+    cog.server_resolved = 0
+    cog.status = None
+    cog.status_checked = 0
+    return cog
+
+
+def java_server(online=3, max_players=20):
+    server = MagicMock()
+    server.async_status = AsyncMock(
+        return_value=SimpleNamespace(
+            version=SimpleNamespace(name="1.21"),
+            players=SimpleNamespace(online=online, max=max_players),
+        )
+    )
+    return server
+
+
+@pytest.mark.asyncio
+async def test_poll_status_updates_the_snapshot():
+    cog = make_cog()
+    lookup = AsyncMock(return_value=java_server())
+    with patch.object(minecraft.JavaServer, "async_lookup", lookup):
+        await cog.poll_status()
+
+    assert cog.status == {
+        "online": True,
+        "version": "1.21",
+        "players_online": 3,
+        "max_players": 20,
+    }
+    assert cog.status_checked == pytest.approx(time.time(), abs=5)
+
+
+@pytest.mark.asyncio
+async def test_poll_status_marks_the_server_offline_and_resolves_again():
+    cog = make_cog()
+    server = java_server()
+    server.async_status.side_effect = OSError("connection refused")
+    lookup = AsyncMock(return_value=server)
+    with patch.object(minecraft.JavaServer, "async_lookup", lookup):
+        await cog.poll_status()
+        assert cog.status["online"] is False
+        assert cog.server is None
+
+        server.async_status.side_effect = None
+        await cog.poll_status()
+
+    assert cog.status["online"] is True
+    assert lookup.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_server_caches_the_lookup_for_the_ttl():
+    cog = make_cog()
+    lookup = AsyncMock(side_effect=[java_server(), java_server()])
+    with patch.object(minecraft.JavaServer, "async_lookup", lookup):
+        first = await cog.resolve_server()
+        assert await cog.resolve_server() is first
+        assert lookup.await_count == 1
+
+        cog.server_resolved = time.time() - minecraft.MC_LOOKUP_TTL - 1
+        assert await cog.resolve_server() is not first
+
+    assert lookup.await_count == 2
+
+
+def status_interaction():
+    interaction = MagicMock()
+    interaction.response.is_done.return_value = False
+    interaction.response.send_message = AsyncMock()
+    interaction.followup.send = AsyncMock()
+
+    async def defer(**kwargs):
+        interaction.response.is_done.return_value = True
+
+    interaction.response.defer = AsyncMock(side_effect=defer)
+    return interaction
+
+
+@pytest.mark.asyncio
+async def test_mcstatus_answers_from_the_snapshot():
+    cog = make_cog()
+    cog.status = {
+        "online": True,
+        "version": "1.21",
+        "players_online": 5,
+        "max_players": 20,
+    }
+    cog.status_checked = 1700000000
+    cog.poll_status = AsyncMock()
+    interaction = status_interaction()
+
+    await minecraft.Minecraft.mcstatus.callback(cog, interaction)
+
+    cog.poll_status.assert_not_awaited()
+    interaction.response.defer.assert_not_awaited()
+    embed = interaction.response.send_message.await_args.kwargs["embed"]
+    fields = {field.name: field.value for field in embed.fields}
+    assert fields["Players"] == "5/20"
+    assert fields["Last Checked"] == "<t:1700000000:R>"
+
+
+@pytest.mark.asyncio
+async def test_mcstatus_polls_when_there_is_no_snapshot_yet():
+    cog = make_cog()
+    interaction = status_interaction()
+    lookup = AsyncMock(return_value=java_server(online=0))
+    with patch.object(minecraft.JavaServer, "async_lookup", lookup):
+        await minecraft.Minecraft.mcstatus.callback(cog, interaction)
+
+    interaction.response.defer.assert_awaited_once()
+    interaction.response.send_message.assert_not_awaited()
+    embed = interaction.followup.send.await_args.kwargs["embed"]
+    fields = {field.name: field.value for field in embed.fields}
+    assert fields["Status"] == "🟢 Online"
+    assert fields["Players"] == "0/20"
@@ -1,6 +1,11 @@
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
 
-from cogs.tutorials import make_human_readable_list
+from cogs import tutorials
+from cogs.tutorials import TutorialCatalogue, make_human_readable_list
 
 
 @pytest.mark.parametrize(
@@ -22,3 +27,91 @@ def test_make_human_readable_list(items, expected):
     output = make_human_readable_list(items)
     print("\n", items, "-> ", repr(output))
     assert output == expected
+
+
+def write_modules(path, modules):
+    path.write_text(json.dumps(modules), encoding="utf-8")
+
+
+def test_catalogue_prerenders_embeds(tmp_path):
+    path = tmp_path / "modules.json"
+    write_modules(
+        path,
+        {
+            "WIP": {"emoji": "🛠️", "fields": [{"name": "Theory", "value": "WIP!"}]},
+            "CO1101": {"description": "Computing Fundamentals", "authors": ["A", "B"]},
+        },
+    )
+    catalogue = TutorialCatalogue(str(path))
+
+    assert catalogue.refresh()
+    embed = catalogue.get("CO1101")
+    assert embed.title == "Tutorial for CO1101"
+    assert [f.name for f in embed.fields] == ["Theory"]
+    assert embed.footer.text == "Tutorial resources created by: A and B"
+    assert [o.label for o in catalogue.options(catalogue.codes())] == ["CO1101"]
+    assert catalogue.get("WIP") is None
+
+
+def test_catalogue_reloads_only_on_change(tmp_path):
+    path = tmp_path / "modules.json"
+    write_modules(path, {"CO1101": {}})
+    catalogue = TutorialCatalogue(str(path))
+    catalogue.refresh()
+    first = catalogue.entries
+
+    assert not catalogue.refresh()
+    os.utime(path, ns=(0, 1))
+    assert not catalogue.refresh()
+    assert catalogue.entries is first
+
+    write_modules(path, {"CO1101": {}, "CO1102": {}})
+    os.utime(path, ns=(0, 2))
+    assert catalogue.refresh()
+    assert list(catalogue.entries) == ["CO1101", "CO1102"]
+
+    path.write_text("{broken", encoding="utf-8")
+    os.utime(path, ns=(0, 3))
+    assert not catalogue.refresh()
+    assert list(catalogue.entries) == ["CO1101", "CO1102"]
+
+
+@pytest.mark.asyncio
+async def test_tutorials_view_paginates_past_25_modules(tmp_path):
+    path = tmp_path / "modules.json"
+    modules = {f"CO{1100 + i}": {} for i in range(30)}
+    modules.update({f"CO{2100 + i}": {} for i in range(3)})
+    write_modules(path, modules)
+
+    catalogue = TutorialCatalogue(str(path))
+    catalogue.refresh()
+    with patch.object(tutorials, "catalogue", catalogue):
+        first = tutorials.Tutorials()
+        last = tutorials.Tutorials(page=1)
+        year_two = tutorials.Tutorials(group="CO Year 2")
+
+    assert len(first.on_select.options) == 25
+    assert [o.label for o in last.on_select.options][-3:] == ["CO2100", "CO2101", "CO2102"]
+    assert [o.label for o in year_two.on_select.options] == ["CO2100", "CO2101", "CO2102"]
+    assert list(catalogue.groups) == ["CO Year 1", "CO Year 2"]
+
+
+@pytest.mark.asyncio
+async def test_group_select_uses_a_non_empty_value_for_all_modules(tmp_path):
+    path = tmp_path / "modules.json"
+    write_modules(path, {"CO1101": {}, "CO2101": {}})
+
+    catalogue = TutorialCatalogue(str(path))
+    catalogue.refresh()
+    with patch.object(tutorials, "catalogue", catalogue):
+        select = tutorials.GroupSelect("CO Year 2")
+        assert all(1 <= len(option.value) <= 100 for option in select.options)
+
+        select._values = [tutorials.ALL_GROUPS]
+        interaction = MagicMock()
+        interaction.response.edit_message = AsyncMock()
+        await select.callback(interaction)
+
+    view = interaction.response.edit_message.await_args.kwargs["view"]
+    assert view.group is None
+    assert [o.label for o in view.on_select.options] == ["CO1101", "CO2101"]
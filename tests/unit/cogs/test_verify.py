@@ -0,0 +1,130 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cogs import verify
+from modules.store import MinecraftStore, VerifyStore
+
+
+@pytest.fixture
+def stores(tmp_path):
+    verify_store = VerifyStore(str(tmp_path / "verify.json"))
+    mc_store = MinecraftStore(str(tmp_path / "minecraft.json"))
+    with patch.object(verify, "verify_store", verify_store), patch.object(
+        verify, "mc_store", mc_store
+    ):
+        yield verify_store, mc_store
+
+
+def make_cog():
+    bot = MagicMock()
+    bot.wait_until_ready = AsyncMock()
+    bot.get_guild.return_value = None
+    cog = verify.Verify.__new__(verify.Verify)
+    cog.bot = bot
+    return cog
+
+
+@pytest.mark.asyncio
+async def test_sweep_expired_unwhitelists_in_one_call(stores):
+    verify_store, mc_store = stores
+    for i in range(3):
+        await verify_store.set(str(i), f"user{i}@student.le.ac.uk", 10)
+        await mc_store.add(str(i), f"Player{i}")
+    await verify_store.set("99", "current@student.le.ac.uk", int(time.time()) + 3600)
+
+    unwhitelist = AsyncMock(return_value=True)
+    with patch.object(verify, "unwhitelist_pipeline", unwhitelist):
+        await make_cog().sweep(["0", "1", "2", "99"])
+
+    unwhitelist.assert_awaited_once_with(["Player0", "Player1", "Player2"])
+    assert [d for d, _ in await verify_store.items()] == ["99"]
+    assert not await mc_store.has("0")
+
+
+@pytest.mark.asyncio
+async def test_sweep_expired_keeps_records_when_unwhitelist_fails(stores):
+    verify_store, mc_store = stores
+    await verify_store.set("1", "user@student.le.ac.uk", 10)
+    await mc_store.add("1", "Player")
+
+    with patch.object(verify, "unwhitelist_pipeline", AsyncMock(return_value=False)):
+        await make_cog().sweep(["1"])
+
+    assert await verify_store.get("1") is not None
+    assert await mc_store.get("1") == ["Player"]
+    assert "1" in verify.expiry_scheduler.expires
+    verify.expiry_scheduler.cancel("1")
+
+
+@pytest.mark.asyncio
+async def test_sweep_handles_records_expiring_in_consecutive_seconds(stores):
+    verify_store, mc_store = stores
+    await verify_store.set("a", "a@student.le.ac.uk", 100)
+    await verify_store.set("b", "b@student.le.ac.uk", 101)
+    await verify_store.set("c", "c@student.le.ac.uk", 200)
+    scheduler = verify.ExpiryScheduler()
+    scheduler.load([("a", 100), ("b", 101), ("c", 200)])
+
+    # The scheduler wakes a second after "a" expired, when "b" is due as well.
+    with patch.object(verify, "expiry_scheduler", scheduler), patch(
+        "time.time", return_value=101.5
+    ):
+        due = scheduler.pop_due(101.5)
+        await make_cog().sweep(due + ["c"])
+
+    assert due == ["a", "b"]
+    assert [d for d, _ in await verify_store.items()] == ["c"]
+    # Handed over too early, so it goes back on the schedule at its own expiry.
+    assert scheduler.expires == {"c": 200}
+
+
+@pytest.mark.asyncio
+async def test_sweep_reschedules_ids_when_a_chunk_fails(stores):
+    verify_store, mc_store = stores
+    await verify_store.set("1", "one@student.le.ac.uk", 10)
+    await verify_store.set("2", "two@student.le.ac.uk", 10)
+    scheduler = verify.ExpiryScheduler()
+
+    with patch.object(verify, "expiry_scheduler", scheduler), patch.object(
+        verify_store, "pop", AsyncMock(side_effect=OSError("disk I/O error"))
+    ):
+        with pytest.raises(OSError):
+            await make_cog().sweep(["1", "2"])
+
+    assert sorted(scheduler.expires) == ["1", "2"]
+    assert min(scheduler.expires.values()) > time.time()
+
+
+@pytest.mark.asyncio
+async def test_ready_buttons_expire_with_the_session_unless_persistent():
+    assert verify.Ready_buttons().timeout == verify.SESSION_TTL
+    assert verify.Ready_buttons(timeout=None).is_persistent()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("entry", ["@", "spam@", "not an email", "a@b"])
+async def test_ban_rejects_invalid_entries(entry):
+    banned_store = MagicMock()
+    interaction = MagicMock()
+    interaction.response.send_message = AsyncMock()
+
+    with patch.object(verify, "banned_store", banned_store):
+        await verify.Verify.ban.callback(make_cog(), interaction, entry)
+
+    banned_store.add.assert_not_called()
+    assert "not a valid" in interaction.response.send_message.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_ban_normalises_a_bare_domain():
+    banned_store = MagicMock()
+    banned_store.add.return_value = True
+    interaction = MagicMock()
+    interaction.response.send_message = AsyncMock()
+
+    with patch.object(verify, "banned_store", banned_store):
+        await verify.Verify.ban.callback(make_cog(), interaction, " @Example.COM ")
+
+    banned_store.add.assert_called_once_with("*@example.com")
@@ -0,0 +1,56 @@
+"""A local stand-in for the Mailjet v3.1 send API, for offline throughput testing.
+
+Run it with `python tests/unit/modules/fake_mailjet.py` and set MAILJET_URL=http://localhost:8025/v3.1/send.
+"""
+
+import asyncio
+
+from aiohttp import web
+
+STATE = web.AppKey("state", dict)
+
+
+def create_app(latency: float = 0.05, fail_first: int = 0) -> web.Application:
+    app = web.Application()
+    state = app[STATE] = {"requests": 0, "messages": []}
+
+    async def send(request: web.Request):
+        state["requests"] += 1
+        payload = await request.json()
+        await asyncio.sleep(latency)
+
+        if state["requests"] <= fail_first:
+            return web.json_response({"ErrorMessage": "Try again"}, status=500)
+
+        # Addresses starting with "invalid" are rejected, like a malformed address would be.
+        results = []
+        for message in payload.get("Messages", []):
+            emails = [to["Email"] for to in message.get("To", [])]
+            if any(email.startswith("invalid") for email in emails):
+                results.append({"Status": "error", "Errors": [{"ErrorCode": "mj-0013"}]})
+                continue
+            state["messages"].append(message)
+            results.append(
+                {"Status": "success", "To": [{"Email": email} for email in emails]}
+            )
+
+        status = 200 if all(r["Status"] == "success" for r in results) else 400
+        return web.json_response({"Messages": results}, status=status)
+
+    app.router.add_post("/v3.1/send", send)
+    return app
+
+
+async def start_fake_mailjet(**kwargs):
+    """Start the fake server on a free port. Returns (runner, state, url)."""
+    app = create_app(**kwargs)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, app[STATE], f"http://127.0.0.1:{port}/v3.1/send"
+
+
+if __name__ == "__main__":
+    web.run_app(create_app(), port=8025)
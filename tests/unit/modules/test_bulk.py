@@ -0,0 +1,67 @@
+import io
+from unittest.mock import patch
+
+import pytest
+
+from modules import bulk
+from modules.store import BannedStore, MinecraftStore, VerifyStore
+
+
+@pytest.fixture
+def stores(tmp_path):
+    verify_store = VerifyStore(str(tmp_path / "verify.json"))
+    mc_store = MinecraftStore(str(tmp_path / "minecraft.json"))
+    banned_store = BannedStore(str(tmp_path / "banned.json"))
+    with patch.object(bulk, "verify_store", verify_store), patch.object(
+        bulk, "mc_store", mc_store
+    ), patch.object(bulk, "banned_store", banned_store):
+        yield verify_store, mc_store, banned_store
+
+
+@pytest.mark.asyncio
+async def test_import_and_export_round_trip(stores):
+    csv_text = (
+        "discord_id,email,expires\n"
+        "277116211022790656,AB123@student.le.ac.uk,100\n"
+        "277116211022790657,cd456@dmu.ac.uk,\n"
+    )
+    result = await bulk.import_rows("verify", bulk.read_rows(io.StringIO(csv_text), "csv"))
+
+    assert result["errors"] == []
+    assert result["imported"] == 2
+
+    out = io.StringIO()
+    bulk.write_rows(await bulk.export_rows("verify"), "jsonl", "verify", out)
+    exported = list(bulk.read_rows(io.StringIO(out.getvalue()), "jsonl"))
+    assert exported[0] == {
+        "discord_id": "277116211022790656",
+        "email": "ab123@student.le.ac.uk",
+        "expires": 100,
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_applies_nothing_when_any_row_is_invalid(stores):
+    _, mc_store, _ = stores
+    rows = [
+        {"discord_id": "277116211022790656", "username": "Steve"},
+        {"discord_id": "277116211022790657", "username": "steve"},
+        {"discord_id": "not-an-id", "username": "Alex"},
+    ]
+
+    result = await bulk.import_rows("minecraft", rows)
+
+    assert result["imported"] == 0
+    assert len(result["errors"]) == 2
+    assert await mc_store.items() == []
+
+
+@pytest.mark.asyncio
+async def test_import_banned_patterns(stores):
+    _, _, banned_store = stores
+    rows = [{"email": "bad@student.le.ac.uk"}, {"email": "@spam.com"}]
+
+    result = await bulk.import_rows("banned", rows)
+
+    assert result["imported"] == 2
+    assert "anyone@spam.com" in banned_store
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from modules.dm_queue import DMQueue
+
+
+class Closed(Exception):
+    pass
+
+
+def make_user(user_id, send=None):
+    user = MagicMock()
+    user.id = user_id
+    user.send = send or AsyncMock()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_delivers_and_records_latency():
+    queue = DMQueue(closed_errors=(Closed,))
+    users = [make_user(i) for i in range(10)]
+
+    results = await asyncio.gather(*(queue.send(u, content="hi") for u in users))
+    await queue.close()
+
+    assert results == [True] * 10
+    users[3].send.assert_awaited_once_with(content="hi")
+    assert queue.stats()["sent"] == 10
+
+
+@pytest.mark.asyncio
+async def test_closed_dms_fail_fast_afterwards():
+    queue = DMQueue(closed_errors=(Closed,))
+    user = make_user(1, AsyncMock(side_effect=Closed()))
+
+    assert await queue.send(user, content="hi") is False
+    assert await queue.send(user, content="hi") is False
+    await queue.close()
+
+    user.send.assert_awaited_once()
+    assert queue.stats()["closed_skips"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sends_to_one_user_never_overlap():
+    active, overlapped = set(), []
+
+    async def send(**kwargs):
+        overlapped.append(1 in active)
+        active.add(1)
+        await asyncio.sleep(0.01)
+        active.discard(1)
+
+    queue = DMQueue(closed_errors=(Closed,), workers=4)
+    user = make_user(1, send)
+    await asyncio.gather(*(queue.send(user, content=str(i)) for i in range(4)))
+    await queue.close()
+
+    assert overlapped == [False] * 4
+
+
+@pytest.mark.asyncio
+async def test_close_resolves_send_in_flight():
+    async def slow_send(**kwargs):
+        await asyncio.sleep(10)
+
+    queue = DMQueue(closed_errors=(Closed,), workers=1)
+    user = make_user(1, slow_send)
+
+    pending = asyncio.create_task(queue.send(user, content="hi"))
+    await asyncio.sleep(0.01)
+    await queue.close()
+
+    assert await asyncio.wait_for(pending, 1) is False
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from modules.expiry import ExpiringResponses, ExpiryScheduler
+
+
+def test_pop_due_returns_only_expired_keys_in_order():
+    scheduler = ExpiryScheduler()
+    scheduler.load([("a", 30), ("b", 10), ("c", 20), ("d", None)])
+
+    assert scheduler.pop_due(25) == ["b", "c"]
+    assert scheduler.next_expiry() == 30
+    assert len(scheduler) == 1
+
+
+def test_rescheduled_and_cancelled_keys_are_skipped():
+    scheduler = ExpiryScheduler()
+    scheduler.schedule("a", 10)
+    scheduler.schedule("b", 20)
+    scheduler.schedule("a", 50)
+    scheduler.cancel("b")
+
+    assert scheduler.pop_due(30) == []
+    assert scheduler.next_expiry() == 50
+
+
+@pytest.mark.asyncio
+async def test_scheduler_wakes_for_new_earlier_expiry():
+    scheduler = ExpiryScheduler()
+    fired = asyncio.Event()
+    received = []
+
+    async def callback(keys):
+        received.extend(keys)
+        fired.set()
+
+    scheduler.schedule("later", time.time() + 3600)
+    scheduler.start(callback)
+    await asyncio.sleep(0)
+
+    scheduler.schedule("soon", time.time() - 2)
+    await asyncio.wait_for(fired.wait(), 1)
+    scheduler.stop()
+
+    assert received == ["soon"]
+
+
+@pytest.mark.asyncio
+async def test_expiring_responses_delete_due_and_remaining_on_close():
+    responses = ExpiringResponses()
+    due, later = AsyncMock(), AsyncMock()
+    due.delete_original_response.side_effect = Exception("already gone")
+
+    responses.add(due, -2)
+    responses.add(later, 3600)
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    due.delete_original_response.assert_awaited_once()
+    later.delete_original_response.assert_not_awaited()
+    assert len(responses) == 1
+
+    await responses.close()
+    later.delete_original_response.assert_awaited_once()
+    assert len(responses) == 0
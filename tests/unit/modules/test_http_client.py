@@ -0,0 +1,85 @@
+import socket
+
+import aiohttp
+import pytest
+
+from modules.http_client import HttpClient
+from fake_mailjet import start_fake_mailjet
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_counted_per_host():
+    runner, state, url = await start_fake_mailjet(latency=0)
+    client = HttpClient()
+    try:
+        for _ in range(3):
+            async with client.post(url, json={"Messages": []}) as resp:
+                assert resp.status == 200
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    stats = client.stats()
+    host = url.split("/")[2]
+    assert list(stats) == [host]
+    assert stats[host]["requests"] == 3
+    assert stats[host]["errors"] == 0
+    assert stats[host]["max_ms"] >= stats[host]["avg_ms"] > 0
+    assert state["requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_are_counted():
+    client = HttpClient()
+    url = f"http://127.0.0.1:{unused_port()}/"
+    try:
+        with pytest.raises(aiohttp.ClientError):
+            async with client.get(url):
+                pass
+    finally:
+        await client.close()
+
+    stats = client.stats()[url.split("/")[2]]
+    assert stats == {"requests": 0, "errors": 1, "avg_ms": 0.0, "max_ms": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_counted():
+    runner, state, url = await start_fake_mailjet(latency=0.5)
+    client = HttpClient(timeout=0.05)
+    try:
+        with pytest.raises(TimeoutError):
+            async with client.post(url, json={"Messages": []}):
+                pass
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    assert client.stats()[url.split("/")[2]]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_until_closed():
+    client = HttpClient()
+    await client.start()
+    session = client.session
+    assert client.session is session
+
+    await client.close()
+    assert session.closed
+    assert client._session is None
+    # Closing twice is harmless.
+    await client.close()
+
+    reopened = client.session
+    assert reopened is not session and not reopened.closed
+    await reopened.close()
+    # A session closed behind the client's back is replaced too.
+    assert client.session is not reopened
+    await client.close()
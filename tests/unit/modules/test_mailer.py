@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from modules.http_client import http_client
+from modules.mailer import EmailDispatcher
+from fake_mailjet import start_fake_mailjet
+
+
+def message(i: int) -> dict:
+    return {
+        "From": {"Email": "auth@example.com"},
+        "To": [{"Email": f"user{i}@student.le.ac.uk"}],
+        "Subject": "Verification Email",
+        "TextPart": f"{i:05d}",
+    }
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_throughput():
+    runner, state, url = await start_fake_mailjet(latency=0.05)
+    dispatcher = EmailDispatcher("key", "secret", url=url, workers=8)
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(dispatcher.send(message(i)) for i in range(40)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await dispatcher.close()
+        await http_client.close()
+        await runner.cleanup()
+
+    print(f"\n40 emails in {elapsed:.2f}s", dispatcher.stats())
+    assert all(results)
+    assert len(state["messages"]) == 40
+    # Mailjet requests go through the shared client, so they show up in /http-stats.
+    assert http_client.stats()[url.split("/")[2]]["requests"] == dispatcher.requests
+    # 40 sequential round-trips would take 2s.
+    assert elapsed < 1.5
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_retries_server_errors():
+    runner, state, url = await start_fake_mailjet(latency=0, fail_first=2)
+    dispatcher = EmailDispatcher("key", "secret", url=url, workers=1, backoff=0.01)
+    try:
+        assert await dispatcher.send(message(1))
+    finally:
+        await dispatcher.close()
+        await http_client.close()
+        await runner.cleanup()
+
+    assert dispatcher.retried == 2
+    assert state["requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_rejects_when_queue_is_full():
+    runner, _, url = await start_fake_mailjet(latency=0.2)
+    dispatcher = EmailDispatcher("key", "secret", url=url, workers=1, queue_size=1)
+    try:
+        first = asyncio.create_task(dispatcher.send(message(1)))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(dispatcher.send(message(2)))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.QueueFull):
+            await dispatcher.send(message(3))
+        assert await first and await second
+    finally:
+        await dispatcher.close()
+        await http_client.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_batches_bursts_into_one_request():
+    runner, state, url = await start_fake_mailjet(latency=0.05)
+    dispatcher = EmailDispatcher("key", "secret", url=url, workers=1, batch_window=0.1)
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(dispatcher.send(message(i)) for i in range(200)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await dispatcher.close()
+        await http_client.close()
+        await runner.cleanup()
+
+    print(f"\n200 emails in {elapsed:.2f}s", dispatcher.stats())
+    assert all(results)
+    assert state["requests"] == 4
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_maps_results_back_to_each_message():
+    runner, _, url = await start_fake_mailjet(latency=0)
+    dispatcher = EmailDispatcher("key", "secret", url=url, workers=1, batch_window=0.05)
+    rejected = message(2)
+    rejected["To"] = [{"Email": "invalid@student.le.ac.uk"}]
+    try:
+        results = await asyncio.gather(
+            dispatcher.send(message(1)), dispatcher.send(rejected), dispatcher.send(message(3))
+        )
+    finally:
+        await dispatcher.close()
+        await http_client.close()
+        await runner.cleanup()
+
+    assert results == [True, False, True]
+    assert dispatcher.retried == 0
+
+
+@pytest.mark.asyncio
+async def test_close_resolves_batch_in_flight():
+    runner, _, url = await start_fake_mailjet(latency=1)
+    dispatcher = EmailDispatcher("key", "secret", url=url, workers=1, batch_window=0)
+    try:
+        pending = asyncio.create_task(dispatcher.send(message(1)))
+        await asyncio.sleep(0.1)
+        await dispatcher.close()
+        await http_client.close()
+        assert await asyncio.wait_for(pending, 1) is False
+    finally:
+        await runner.cleanup()
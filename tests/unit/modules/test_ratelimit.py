@@ -0,0 +1,51 @@
+from modules.ratelimit import RateLimiter, parse_limit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_limit():
+    assert parse_limit("3/600") == (3, 600.0)
+
+
+def test_bucket_refills_over_time():
+    clock = Clock()
+    limiter = RateLimiter({"user": (2, 60)}, clock=clock)
+
+    assert limiter.acquire(user=1) is None
+    assert limiter.acquire(user=1) is None
+    assert limiter.acquire(user=1) == 30
+    assert limiter.acquire(user=2) is None
+
+    clock.now = 30
+    assert limiter.acquire(user=1) is None
+    assert limiter.stats()["rejected"]["user"] == 1
+
+
+def test_rejection_does_not_spend_other_scopes():
+    clock = Clock()
+    limiter = RateLimiter({"user": (5, 60), "total": (1, 60)}, clock=clock)
+
+    assert limiter.acquire(user=1, total=None) is None
+    assert limiter.acquire(user=2, total=None) is not None
+
+    clock.now = 60
+    assert limiter.acquire(user=2, total=None) is None
+    assert limiter.stats()["tracked"]["user"] == 1
+
+
+def test_evict_idle_forgets_refilled_buckets():
+    clock = Clock()
+    limiter = RateLimiter({"user": (1, 10)}, clock=clock)
+    limiter.acquire(user=1)
+    clock.now = 5
+    limiter.acquire(user=2)
+
+    clock.now = 10
+    assert limiter.evict_idle() == 1
+    assert list(limiter.buckets["user"]) == [2]
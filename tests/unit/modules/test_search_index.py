@@ -0,0 +1,30 @@
+from modules.search_index import SearchIndex
+
+INDEX = SearchIndex(
+    {
+        "CO1101": "Computing Fundamentals",
+        "CO1102": "Programming Fundamentals",
+        "CO2101": "Algorithms and Data Structures",
+        "MA1001": "Discrete Mathematics",
+    }
+)
+
+
+def test_empty_query_lists_codes_in_order():
+    assert INDEX.search("", limit=2) == ["CO1101", "CO1102"]
+
+
+def test_code_prefix():
+    assert INDEX.search("co11") == ["CO1101", "CO1102"]
+
+
+def test_description_word_prefix():
+    assert INDEX.search("fund") == ["CO1101", "CO1102"]
+
+
+def test_typo_falls_back_to_trigrams():
+    assert INDEX.search("algorthms")[0] == "CO2101"
+
+
+def test_unrelated_query_finds_nothing():
+    assert INDEX.search("zzzz") == []
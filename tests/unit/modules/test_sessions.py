@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+import pytest
+
+from modules.sessions import CodeCheck, SessionManager
+from modules import store
+from modules.store import PendingStore, hash_code, load_code_secret
+
+
+@pytest.fixture(autouse=True)
+def code_secret(monkeypatch):
+    monkeypatch.setattr(store, "_code_secret", b"test-secret")
+
+
+def test_check_accepts_the_right_code_once():
+    sessions = SessionManager()
+    sessions.start(1, "a@student.le.ac.uk", "student.le.ac.uk", 123, True)
+
+    result, session = sessions.check(1, "00123")
+
+    assert result == CodeCheck.OK
+    assert session.email == "a@student.le.ac.uk"
+    assert sessions.check(1, "00123")[0] == CodeCheck.EXPIRED
+
+
+def test_wrong_codes_lock_the_session():
+    sessions = SessionManager(max_attempts=2)
+    sessions.start(1, "a@student.le.ac.uk", "student.le.ac.uk", 123, True)
+
+    assert sessions.check(1, "1")[0] == CodeCheck.WRONG
+    assert sessions.check(1, "abc")[0] == CodeCheck.LOCKED
+    assert len(sessions) == 0
+
+
+def test_new_attempt_replaces_old_one():
+    sessions = SessionManager()
+    sessions.start(1, "old@student.le.ac.uk", "student.le.ac.uk", 1, True)
+    sessions.start(1, "new@student.le.ac.uk", "student.le.ac.uk", 2, True)
+
+    assert len(sessions) == 1
+    assert sessions.get(1).email == "new@student.le.ac.uk"
+    assert sessions.stats()["replaced"] == 1
+
+
+def test_expired_and_excess_sessions_are_evicted():
+    sessions = SessionManager(ttl=60, max_sessions=2)
+    with patch("modules.sessions.time.time", return_value=0):
+        sessions.start(1, "a@dmu.ac.uk", "dmu.ac.uk", 1, True)
+        sessions.start(2, "b@dmu.ac.uk", "dmu.ac.uk", 1, True)
+        sessions.start(3, "c@dmu.ac.uk", "dmu.ac.uk", 1, True)
+        assert list(sessions.sessions) == [2, 3]
+
+    with patch("modules.sessions.time.time", return_value=61):
+        assert sessions.get(2) is None
+        assert sessions.stats()["live"] == 0
+
+
+def test_sessions_survive_a_restart(tmp_path):
+    store = PendingStore(str(tmp_path / "pending.json"))
+    sessions = SessionManager(store=store)
+    sessions.start(1, "a@student.le.ac.uk", "student.le.ac.uk", 4321, False)
+    sessions.check(1, "1")
+    store.flush()
+
+    raw = (tmp_path / "pending.json").read_text()
+    assert "4321" not in raw
+
+    restarted = SessionManager(store=PendingStore(str(tmp_path / "pending.json")))
+    restarted.load()
+
+    assert restarted.get(1).attempts == 1
+    result, session = restarted.check(1, "4321")
+    assert result == CodeCheck.OK
+    assert session.send_welcome is False
+    assert restarted.store.items() == []
+
+
+def test_code_hash_is_keyed(monkeypatch):
+    first = hash_code(4321, "salt")
+    monkeypatch.setattr(store, "_code_secret", b"another-secret")
+
+    assert hash_code(4321, "salt") != first
+
+
+def test_code_secret_is_generated_once_outside_pending_json(tmp_path, monkeypatch):
+    monkeypatch.delenv("PENDING_CODE_SECRET", raising=False)
+    path = str(tmp_path / ".pending_secret")
+
+    assert load_code_secret(path) == load_code_secret(path)
+    monkeypatch.setenv("PENDING_CODE_SECRET", "from-env")
+    assert load_code_secret(path) == b"from-env"
@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+from modules.sqlite_store import (
+    DatabaseNotEmpty,
+    SqliteDatabase,
+    SqliteMinecraftStore,
+    SqliteVerifyStore,
+    migrate_json_to_sqlite,
+)
+from modules.store import BannedStore, MinecraftStore, VerifyStore
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def stores(request, tmp_path):
+    if request.param == "json":
+        verify = VerifyStore(str(tmp_path / "verify.json"))
+        mc = MinecraftStore(str(tmp_path / "minecraft.json"))
+    else:
+        database = SqliteDatabase(str(tmp_path / "test.db"))
+        verify = SqliteVerifyStore(database)
+        mc = SqliteMinecraftStore(database)
+    verify.load()
+    mc.load()
+    return verify, mc
+
+
+@pytest.mark.asyncio
+async def test_verify_store(stores):
+    verify, _ = stores
+
+    await verify.set("1", "AB123@student.le.ac.uk", 100)
+    await verify.set("2", "cd456@dmu.ac.uk", 300)
+
+    assert await verify.has("1")
+    assert await verify.get("1") == {"email": "AB123@student.le.ac.uk", "expires": 100}
+    assert await verify.find_by_email(" ab123@STUDENT.le.ac.uk ") == "1"
+
+    assert await verify.pop("1") == {"email": "AB123@student.le.ac.uk", "expires": 100}
+    assert await verify.pop("1") is None
+    assert await verify.find_by_email("ab123@student.le.ac.uk") is None
+
+
+@pytest.mark.asyncio
+async def test_verify_store_email_index_follows_updates(stores):
+    verify, _ = stores
+
+    await verify.set("1", "old@student.le.ac.uk", 100)
+    await verify.set("1", "new@student.le.ac.uk", 100)
+
+    assert await verify.find_by_email("old@student.le.ac.uk") is None
+    assert await verify.find_by_email("new@student.le.ac.uk") == "1"
+
+
+@pytest.mark.asyncio
+async def test_minecraft_store(stores):
+    _, mc = stores
+
+    await mc.add("1", "Tweakified")
+    await mc.add("1", "Steve")
+
+    assert await mc.has("1")
+    assert await mc.find_by_username("tweakified") == "1"
+    assert await mc.get("1") == ["Tweakified", "Steve"]
+    assert await mc.pop("1") == ["Tweakified", "Steve"]
+    assert await mc.pop("1") == []
+    assert not await mc.has("1")
+
+
+@pytest.mark.asyncio
+async def test_json_writes_are_batched_until_flush(tmp_path):
+    path = tmp_path / "verify.json"
+    store = VerifyStore(str(path))
+    store.load()
+
+    for i in range(50):
+        await store.set(str(i), f"user{i}@student.le.ac.uk", i)
+
+    assert read_json(path) == {}
+
+    store.flush()
+    assert len(read_json(path)) == 50
+
+
+def test_banned_store_normalises_emails(tmp_path):
+    path = tmp_path / "banned.json"
+    path.write_text(json.dumps(["Bad@Student.le.ac.uk"]), encoding="utf-8")
+    store = BannedStore(str(path))
+
+    assert "bad@student.le.ac.uk" in store
+    assert store.add("BAD@student.le.ac.uk ") is False
+    assert store.add("other@dmu.ac.uk") is True
+    assert read_json(path) == ["bad@student.le.ac.uk", "other@dmu.ac.uk"]
+
+
+def test_banned_store_patterns(tmp_path):
+    path = tmp_path / "banned.json"
+    path.write_text(
+        json.dumps(["@spam.com", "*@*.bots.net", "spam*@student.le.ac.uk"]),
+        encoding="utf-8",
+    )
+    store = BannedStore(str(path))
+
+    assert "anyone@spam.com" in store
+    assert "anyone@notspam.com" not in store
+    assert "x@mail.bots.net" in store
+    assert "x@bots.net" not in store
+    assert "spammer1@student.le.ac.uk" in store
+    assert "ab123@student.le.ac.uk" not in store
+    assert store.add("other@spam.com") is False
+
+
+def test_banned_store_hashes_emails_when_salted(tmp_path):
+    path = tmp_path / "banned.json"
+    path.write_text(json.dumps(["Bad@student.le.ac.uk", "*@spam.com"]), encoding="utf-8")
+    store = BannedStore(str(path), salt="pepper")
+
+    assert "bad@student.le.ac.uk" in store
+    assert store.add("new@dmu.ac.uk") is True
+    store.flush()
+
+    saved = read_json(path)
+    assert "*@spam.com" in saved
+    assert not any("student.le.ac.uk" in e or "dmu.ac.uk" in e for e in saved)
+    assert "new@dmu.ac.uk" in BannedStore(str(path), salt="pepper")
+
+
+@pytest.mark.asyncio
+async def test_migrate_json_to_sqlite(tmp_path):
+    verify_path = tmp_path / "verify.json"
+    mc_path = tmp_path / "minecraft.json"
+    verify_path.write_text(
+        json.dumps({"1": {"email": "a@student.le.ac.uk", "expires": 5}}),
+        encoding="utf-8",
+    )
+    mc_path.write_text(json.dumps({"1": ["Steve", "steve"]}), encoding="utf-8")
+
+    database = SqliteDatabase(str(tmp_path / "test.db"))
+    assert migrate_json_to_sqlite(str(verify_path), str(mc_path), database) == (1, 2, 1)
+
+    assert await SqliteVerifyStore(database).find_by_email("A@student.le.ac.uk") == "1"
+    assert await SqliteMinecraftStore(database).get("1") == ["Steve"]
+
+
+@pytest.mark.asyncio
+async def test_migrate_refuses_a_database_in_use_unless_forced(tmp_path):
+    verify_path = tmp_path / "verify.json"
+    mc_path = tmp_path / "minecraft.json"
+    verify_path.write_text(
+        json.dumps({"1": {"email": "a@student.le.ac.uk", "expires": 5}}),
+        encoding="utf-8",
+    )
+    mc_path.write_text(json.dumps({"1": ["Steve"]}), encoding="utf-8")
+    database = SqliteDatabase(str(tmp_path / "test.db"))
+    migrate_json_to_sqlite(str(verify_path), str(mc_path), database)
+
+    # Changes made on SQLite after the first migration.
+    verify_store = SqliteVerifyStore(database)
+    mc_store = SqliteMinecraftStore(database)
+    await verify_store.pop("1")
+    await mc_store.add("2", "Alex")
+
+    with pytest.raises(DatabaseNotEmpty):
+        migrate_json_to_sqlite(str(verify_path), str(mc_path), database)
+    assert not await verify_store.has("1")
+    assert await mc_store.get("2") == ["Alex"]
+
+    migrate_json_to_sqlite(str(verify_path), str(mc_path), database, force=True)
+    assert await verify_store.has("1")
+    assert await mc_store.get("2") == []